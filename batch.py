@@ -0,0 +1,217 @@
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+import levels
+import search
+
+# Headless batch solver.  Reads levels in the levels.py text format from a
+# file or stdin, solves them on a process pool and prints one JSON result
+# line per level as soon as its chunk finishes (so output order follows
+# completion, use "index" to match inputs).  At most `workers * backlog`
+# chunks are in flight, so memory stays flat however long the input is.
+# Workers only need solve_chunk, so the pool, argparse and the GUI modules
+# are imported where they are used and a spawned worker starts in a few ms.
+
+ENGINES = ("bfs", "dfs", "astar", "jps", "alt", "bidirectional", "ucs", "two-block",
+           "ida", "iddfs")
+# Engines that ignore --model, and the moves they really use.
+FIXED_MODELS = {"jps": "step", "ucs": "slide"}
+
+_uniform = None
+
+
+def uniform_module():
+    # UNIFORM.PY has an upper-case suffix that the import system skips.
+    global _uniform
+    if _uniform is None:
+        import importlib.machinery
+        import importlib.util
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "UNIFORM.PY")
+        loader = importlib.machinery.SourceFileLoader("uniform", path)
+        spec = importlib.util.spec_from_loader("uniform", loader)
+        _uniform = importlib.util.module_from_spec(spec)
+        loader.exec_module(_uniform)
+    return _uniform
+
+
+def find_path(board, start, goal, engine="bfs", model="step", table_size=search.TABLE_SIZE,
+              stats=None):
+    if engine == "ucs":
+        ucs = uniform_module().UniformCostSearch(start, goal, board)
+        path = ucs.search(stats)
+        return [start] + path if path or start == goal else []
+    moves = search.MOVE_MODELS[model](board)
+    if engine == "bfs":
+        path = search.bfs(board, start, goal, moves, stats)
+    elif engine == "dfs":
+        path = search.dfs(board, start, goal, moves, stats)
+    elif engine == "jps":
+        path = search.jps(board, start, goal, stats)
+    elif engine == "iddfs":
+        path = search.iddfs(board, start, goal, moves, table_size, stats=stats)
+    elif engine == "bidirectional":
+        path = search.bidirectional_bfs(board, start, goal, moves, stats=stats)
+    else:
+        heuristic = None
+        if engine == "alt":
+            import landmarks
+            heuristic = landmarks.landmark_table(board, model=model).heuristic(goal)
+        elif model == "slide":
+            # Manhattan distance overestimates slides; fall back to Dijkstra.
+            heuristic = lambda cell: 0
+        if engine == "ida":
+            path = search.ida_star(board, start, goal, heuristic, moves, table_size,
+                                   stats=stats)
+        else:
+            path = search.astar(board, start, goal, heuristic, moves, stats)
+    return path
+
+
+def solve_level(level, engine="bfs", model="step", backend="list",
+                table_size=search.TABLE_SIZE, prune=False, store=None):
+    # store: a solutions.SolutionStore consulted before searching.
+    board = levels.level_board(level, backend)
+    if prune:
+        import reach
+        reach.reachability(board, FIXED_MODELS.get(engine, model))
+    start, goal = level["start"], level["goal"]
+    stats = search.SearchStats()
+    began = time.perf_counter()
+
+    if engine == "two-block":
+        import mine
+        blocks = levels.level_blocks(level)
+        state = mine.State(board, [start for start, goal in blocks], [goal for start, goal in blocks])
+        path = state.solve(stats)
+        length = len(path) if path is not None else -1
+    else:
+        def find():
+            return find_path(board, start, goal, engine, model, table_size, stats)
+
+        if store is None:
+            path = find()
+        else:
+            import solutions
+            path = store.path(board, start, goal, find, FIXED_MODELS.get(engine, model),
+                              solutions.engine_kind(engine))
+        length = len(path) - 1
+
+    result = {"path": path, "length": length, "time": time.perf_counter() - began}
+    result.update(stats.as_dict())
+    return result
+
+
+def solve_chunk(chunk, engine, model, backend, table_size=search.TABLE_SIZE, prune=False,
+                store_path=None):
+    store = None
+    if store_path is not None:
+        import solutions
+        store = solutions.SolutionStore(store_path)
+    results = []
+    try:
+        for index, line in chunk:
+            try:
+                result = solve_level(levels.parse_level(line), engine, model, backend,
+                                     table_size, prune, store)
+            except Exception as error:
+                # One malformed level (e.g. "start": 5) must not sink the run.
+                result = {"error": f"{type(error).__name__}: {error}"}
+            result["index"] = index
+            results.append(result)
+    finally:
+        if store is not None:
+            store.close()
+    return results
+
+
+def numbered_lines(stream):
+    index = 0
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("//"):
+            yield index, line
+            index += 1
+
+
+def chunks(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run(stream, output, engine="bfs", model="step", backend="list",
+        workers=None, chunksize=64, backlog=4, table_size=search.TABLE_SIZE, prune=False,
+        store_path=None):
+    def emit(results):
+        for result in results:
+            output.write(json.dumps(result, separators=(",", ":")) + "\n")
+        output.flush()
+
+    pending = chunks(numbered_lines(stream), chunksize)
+    if workers == 1:
+        for chunk in pending:
+            emit(solve_chunk(chunk, engine, model, backend, table_size, prune, store_path))
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        limit = workers * backlog
+        running = set()
+        for chunk in pending:
+            running.add(pool.submit(solve_chunk, chunk, engine, model, backend, table_size,
+                                     prune, store_path))
+            # Finished chunks go out as soon as they are seen, not only once
+            # the backlog is full; a full backlog waits for one to finish.
+            if len(running) >= limit:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+            else:
+                done = {future for future in running if future.done()}
+                running -= done
+            for future in done:
+                emit(future.result())
+        for future in as_completed(running):
+            emit(future.result())
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Solve Zero Squares levels in bulk.")
+    parser.add_argument("input", nargs="?", default="-", help="level file, or - for stdin")
+    parser.add_argument("--engine", choices=ENGINES, default="bfs")
+    parser.add_argument("--model", choices=sorted(search.MOVE_MODELS), default="step",
+                        help="move model for bfs/dfs/astar/alt/bidirectional/ida/iddfs")
+    parser.add_argument("--backend", choices=("list", "flat", "numpy"), default="list")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count, 1 runs in-process)")
+    parser.add_argument("--chunksize", type=int, default=64)
+    parser.add_argument("--backlog", type=int, default=4, help="chunks in flight per worker")
+    parser.add_argument("--table-size", type=int, default=search.TABLE_SIZE,
+                        help="ida/iddfs transposition table slots (0 disables)")
+    parser.add_argument("--prune", action="store_true",
+                        help="precompute per-board reachability so dead cells are skipped "
+                             "and unsolvable levels fail at once")
+    parser.add_argument("--store", default=None, metavar="PATH",
+                        help="SQLite solution cache shared across runs; rotated and mirrored "
+                             "copies of a level are answered from it without searching")
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        run(sys.stdin, sys.stdout, args.engine, args.model, args.backend,
+            args.workers, args.chunksize, args.backlog, args.table_size, args.prune,
+            args.store)
+    else:
+        with open(args.input, encoding="utf-8") as stream:
+            run(stream, sys.stdout, args.engine, args.model, args.backend,
+                args.workers, args.chunksize, args.backlog, args.table_size, args.prune,
+                args.store)
+
+
+if __name__ == "__main__":
+    main()
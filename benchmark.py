@@ -0,0 +1,276 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import batch
+import landmarks
+import reach
+import search
+import zero
+from board import Board
+
+# Benchmark harness for the search engines.  Every board family is built
+# from a seed, so two runs on the same code measure the same boards.  Each
+# (family, size, engine) cell records the best wall time over `repeat` runs,
+# nodes expanded, peak frontier size and the tracemalloc peak of one extra
+# traced run.  `compare` diffs two result files and exits non-zero when an
+# engine got slower or hungrier than the baseline allows.
+
+FAMILIES = ("open", "maze", "corridor", "manual")
+ENGINES = ("bfs", "dfs", "dfs_step", "astar", "jps", "alt", "bidirectional", "ucs", "ucs-bucket",
+           "ida", "iddfs")
+MANUAL_WALLS = [
+    (1, 3), (2, 3), (3, 3), (4, 3),
+    (5, 2), (5, 3), (5, 4),
+    (7, 6), (6, 6), (5, 6), (4, 6),
+    (3, 8), (4, 8), (5, 8),
+    (2, 5), (6, 2), (8, 4)
+]
+# bidirectional and ucs search slides, the other engines single steps.
+MODELS = {engine: "slide" if engine in ("bidirectional", "ucs", "ucs-bucket") else "step"
+          for engine in ENGINES}
+# dfs_step is the one-cell-per-call animation stepper from zero.py; it and
+# the iterative-deepening engines trade time for memory and are skipped on
+# boards with more cells than these.
+CELL_LIMITS = {"dfs_step": 250000, "ida": 2500, "iddfs": 2500}
+
+
+def bordered(size):
+    return [[0 if i in (0, size - 1) or j in (0, size - 1) else 1 for j in range(size)]
+            for i in range(size)]
+
+
+def open_layout(size, rng):
+    return bordered(size)
+
+
+def maze_layout(size, rng):
+    # Iterative recursive-backtracker maze on the odd cells.
+    grid = [[0] * size for _ in range(size)]
+    start = (1, 1)
+    grid[1][1] = 1
+    stack = [start]
+    while stack:
+        row, col = stack[-1]
+        options = [(row + dr, col + dc, dr, dc) for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                   if 0 < row + dr < size - 1 and 0 < col + dc < size - 1
+                   and not grid[row + dr][col + dc]]
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col, dr, dc = rng.choice(options)
+        grid[row + dr // 2][col + dc // 2] = 1
+        grid[next_row][next_col] = 1
+        stack.append((next_row, next_col))
+    return grid
+
+
+def corridor_layout(size, rng):
+    # Serpentine corridors: every other row is a wall with one gap that
+    # alternates between the two ends.
+    grid = bordered(size)
+    for number, row in enumerate(range(2, size - 2, 2)):
+        gap = size - 2 if number % 2 == 0 else 1
+        for col in range(1, size - 1):
+            if col != gap:
+                grid[row][col] = 0
+    return grid
+
+
+def manual_layout(size, rng):
+    # The hardcoded 10x10 manual_walls layout, tiled across the board.
+    grid = bordered(size)
+    for top in range(0, size, 10):
+        for left in range(0, size, 10):
+            for row, col in MANUAL_WALLS:
+                if 0 < top + row < size - 1 and 0 < left + col < size - 1:
+                    grid[top + row][left + col] = 0
+    return grid
+
+
+LAYOUTS = {"open": open_layout, "maze": maze_layout,
+           "corridor": corridor_layout, "manual": manual_layout}
+
+
+def make_board(family, size, seed):
+    # The board, the start (first open cell) and a goal per move model.
+    # Steps aim at the last open cell.  Slides cannot reach most cells, so
+    # their goal is the cell farthest from the start in slides (the last
+    # such cell on ties), or None when the start cannot slide at all.
+    rng = random.Random(f"{family}:{size}:{seed}")
+    board = Board(size, size, layout=LAYOUTS[family](size, rng))
+    open_cells = [cell for cell, value in enumerate(board.open_cells) if value]
+    start = open_cells[0]
+    distance = search.distances(board, start, search.slide_moves(board))
+    farthest = max(range(len(distance)), key=lambda cell: (distance[cell], cell))
+    goals = {"step": board.position(open_cells[-1]),
+             "slide": board.position(farthest) if distance[farthest] > 0 else None}
+    return board, board.position(start), goals
+
+
+def run_engine(engine, board, start, goal, stats):
+    if engine == "bfs":
+        return search.bfs(board, start, goal, stats=stats)
+    if engine == "dfs":
+        return search.dfs(board, start, goal, stats=stats)
+    if engine == "astar":
+        return search.astar(board, start, goal, stats=stats)
+    if engine == "jps":
+        return search.jps(board, start, goal, stats=stats)
+    if engine == "alt":
+        heuristic = landmarks.landmark_table(board).heuristic(goal)
+        return search.astar(board, start, goal, heuristic, stats=stats)
+    if engine == "bidirectional":
+        return search.bidirectional_bfs(board, start, goal, stats=stats)
+    if engine in ("ucs", "ucs-bucket"):
+        queue = "bucket" if engine == "ucs-bucket" else "heap"
+        ucs = batch.uniform_module().UniformCostSearch(start, goal, board, queue=queue)
+        path = ucs.search(stats)
+        return [start] + path if path else path
+    if engine == "ida":
+        return search.ida_star(board, start, goal, table_size=search.TABLE_SIZE, stats=stats)
+    if engine == "iddfs":
+        return search.iddfs(board, start, goal, table_size=search.TABLE_SIZE, stats=stats)
+    if engine == "dfs_step":
+        state = zero.State(board, start, goal)
+        steps = 0
+        while not state.dfs_step():
+            steps += 1
+            if not state.path:
+                break
+        stats.expanded = steps
+        stats.max_frontier = len(state.path)
+        return list(state.path)
+    raise ValueError(f"unknown engine: {engine}")
+
+
+def measure(engine, board, start, goal, repeat):
+    best = None
+    for _ in range(repeat):
+        stats = search.SearchStats()
+        began = time.perf_counter()
+        path = run_engine(engine, board, start, goal, stats)
+        elapsed = time.perf_counter() - began
+        if best is None or elapsed < best:
+            best = elapsed
+
+    tracemalloc.start()
+    run_engine(engine, board, start, goal, search.SearchStats())
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {"time": best, "peak_memory": peak_memory, "length": len(path) - 1 if path else -1}
+    result.update(stats.as_dict())
+    return result
+
+
+def run(sizes, families, engines, repeat=3, seed=0, log=sys.stderr):
+    batch.uniform_module()
+    results = []
+    for family in families:
+        for size in sizes:
+            board, start, goals = make_board(family, size, seed)
+            # Shared tables are built outside the timed region.
+            board.slides
+            board.reverse_slides
+            reach.reachability(board, "step", "slide")
+            if "alt" in engines:
+                landmarks.landmark_table(board)
+            for engine in engines:
+                if size * size > CELL_LIMITS.get(engine, size * size):
+                    continue
+                goal = goals[MODELS[engine]]
+                if goal is None:
+                    print(f"{family:8} {size:5} {engine:13} skipped: the start cannot slide",
+                          file=log)
+                    continue
+                result = {"family": family, "size": size, "engine": engine,
+                          "model": MODELS[engine], "start": start, "goal": goal}
+                result.update(measure(engine, board, start, goal, repeat))
+                results.append(result)
+                print(f"{family:8} {size:5} {engine:13} {result['time']:9.4f}s "
+                      f"expanded={result['expanded']} frontier={result['max_frontier']} "
+                      f"memory={result['peak_memory']}", file=log)
+    return {"python": platform.python_version(), "seed": seed, "repeat": repeat,
+            "results": results}
+
+
+def compare(baseline, current, threshold=0.2, memory_threshold=0.2, min_time=0.001):
+    # Returns one message per regression beyond the allowed slack.  Timing
+    # changes smaller than `min_time` seconds are treated as noise.
+    def key(result):
+        return result["family"], result["size"], result["engine"]
+
+    before = {key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = before.get(key(result))
+        if old is None:
+            continue
+        name = "/".join(str(part) for part in key(result))
+        if (result["time"] > old["time"] * (1 + threshold) and
+                result["time"] - old["time"] > min_time):
+            regressions.append(f"{name}: time {old['time']:.4f}s -> {result['time']:.4f}s")
+        if result["expanded"] > old["expanded"]:
+            regressions.append(f"{name}: expanded {old['expanded']} -> {result['expanded']}")
+        if result["peak_memory"] > old["peak_memory"] * (1 + memory_threshold):
+            regressions.append(f"{name}: memory {old['peak_memory']} -> {result['peak_memory']}")
+        if result["length"] != old["length"] and result["engine"] not in ("dfs", "dfs_step"):
+            regressions.append(f"{name}: length {old['length']} -> {result['length']}")
+    return regressions
+
+
+def split(text, cast=str):
+    return [cast(item) for item in text.split(",") if item]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Zero Squares search engines.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    measure_parser = commands.add_parser("run")
+    measure_parser.add_argument("--sizes", type=lambda text: split(text, int),
+                                default=[10, 50, 200, 500], help="e.g. 10,100,500,2000")
+    measure_parser.add_argument("--families", type=split, default=list(FAMILIES))
+    measure_parser.add_argument("--engines", type=split, default=list(ENGINES))
+    measure_parser.add_argument("--repeat", type=int, default=3)
+    measure_parser.add_argument("--seed", type=int, default=0)
+    measure_parser.add_argument("--output", default="-", help="results file, or - for stdout")
+    compare_parser = commands.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2,
+                                help="allowed relative slowdown")
+    compare_parser.add_argument("--memory-threshold", type=float, default=0.2)
+    compare_parser.add_argument("--min-time", type=float, default=0.001,
+                                help="ignore slowdowns smaller than this many seconds")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        unknown = set(args.families) - set(FAMILIES) | set(args.engines) - set(ENGINES)
+        if unknown:
+            parser.error(f"unknown family or engine: {', '.join(sorted(unknown))}")
+        report = run(args.sizes, args.families, args.engines, args.repeat, args.seed)
+        text = json.dumps(report, indent=1)
+        if args.output == "-":
+            print(text)
+        else:
+            with open(args.output, "w", encoding="utf-8") as stream:
+                stream.write(text + "\n")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as stream:
+        baseline = json.load(stream)
+    with open(args.current, encoding="utf-8") as stream:
+        current = json.load(stream)
+    regressions = compare(baseline, current, args.threshold, args.memory_threshold, args.min_time)
+    for message in regressions:
+        print(message)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
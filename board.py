@@ -0,0 +1,274 @@
+from array import array
+
+DIRECTIONS = ["up", "down", "left", "right"]
+DIRECTION_INDEX = {direction: d for d, direction in enumerate(DIRECTIONS)}
+BACKENDS = ("list", "flat", "numpy")
+OPEN_TABLE = bytes([0] + [1] * 255)
+LAYOUT_TABLE = bytes(0 if byte == ord("#") else 1 for byte in range(256))
+
+
+class FlatGrid:
+    # The grid as one uint8 buffer surrounded by a ring of 0 (wall) sentinel
+    # cells.  Cell (row, col) lives at index (row + 1) * stride + col + 1, so
+    # stepping one cell off the board always lands on a wall and needs no
+    # bounds check (see Board.open_at).  grid[row] is a zero-copy memoryview
+    # of that row's interior, so grid[row][col] reads and writes work as with
+    # lists.  The slide table (Board.slides) is separate and costs another
+    # 16 bytes per cell once built.
+    def __init__(self, rows, cols, fill=1, use_numpy=False):
+        self.rows = rows
+        self.cols = cols
+        self.stride = cols + 2
+        size = (rows + 2) * self.stride
+        if use_numpy:
+            # Imported here so the default backends load without numpy.
+            try:
+                import numpy as np
+            except ImportError:
+                raise ImportError("the numpy grid backend requires numpy") from None
+            self.data = np.zeros(size, dtype=np.uint8)
+        else:
+            self.data = bytearray(size)
+        buffer = memoryview(self.data)
+        self.row_views = []
+        for row in range(rows):
+            start = (row + 1) * self.stride + 1
+            view = buffer[start:start + cols]
+            view[:] = bytes([fill]) * cols
+            self.row_views.append(view)
+
+    def __getitem__(self, row):
+        return self.row_views[row]
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        return iter(self.row_views)
+
+
+class Board:
+    def __init__(self, rows, cols, backend="list", layout=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown grid backend: {backend}")
+        self.rows = rows
+        self.cols = cols
+        self.backend = backend
+        if layout is None:
+            self.grid = self.initialize_grid()
+        else:
+            self.grid = self.load_layout(layout)
+        self.bind_open_at()
+        self._slides = None
+        self._open_cells = None
+        self._reverse_slides = None
+        self._key = None
+
+    def new_grid(self):
+        if self.backend == "list":
+            return [[1 for _ in range(self.cols)] for _ in range(self.rows)]
+        return FlatGrid(self.rows, self.cols, use_numpy=self.backend == "numpy")
+
+    def initialize_grid(self):
+        grid = self.new_grid()
+
+        for i in range(self.rows):
+            grid[i][0] = 0
+            grid[i][self.cols - 1] = 0
+        for j in range(self.cols):
+            grid[0][j] = 0
+            grid[self.rows - 1][j] = 0
+
+        manual_walls = [
+            (1, 3), (2, 3), (3, 3), (4, 3),
+            (5, 2), (5, 3), (5, 4),
+            (7, 6), (6, 6), (5, 6), (4, 6),
+            (3, 8), (4, 8), (5, 8),
+            (2, 5), (6, 2), (8, 4)
+        ]
+
+        for (i, j) in manual_walls:
+            grid[i][j] = 0
+
+        grid[1][1] = 1
+        grid[self.rows - 2][self.cols - 2] = 1
+
+        return grid
+
+    def load_layout(self, layout):
+        # layout is one string per row ("#" is a wall) or rows of 0/1 values.
+        grid = self.new_grid()
+        count = 0
+        for i, line in enumerate(layout):
+            count += 1
+            if isinstance(line, str):
+                values = line.encode("ascii").translate(LAYOUT_TABLE)
+            else:
+                values = bytes(1 if value else 0 for value in line)
+            if len(values) != self.cols:
+                raise ValueError(f"row {i} has {len(values)} cells, expected {self.cols}")
+            grid[i][:] = values if self.backend != "list" else list(values)
+        if count != self.rows:
+            raise ValueError(f"layout has {count} rows, expected {self.rows}")
+        return grid
+
+    def to_layout(self):
+        return ["".join("." if value else "#" for value in grid_row) for grid_row in self.grid]
+
+    def is_open(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.grid[row][col] != 0
+
+    def bind_open_at(self):
+        # board.open_at((row, col)) is is_open for a cell on the board or one
+        # step off it, i.e. any neighbour of an on-board cell, bound once per
+        # board so a check is a single call.  The flat backends read their
+        # buffer directly: the step off lands on the sentinel ring, so they
+        # need no bounds test and no per-row view.  Anything further off
+        # aliases another row there, so positions that did not come from the
+        # board itself (the States' is_valid) go through is_open instead.
+        grid = self.grid
+        if self.backend == "list":
+            rows, cols = self.rows, self.cols
+
+            def open_at(position):
+                row, col = position
+                return 0 <= row < rows and 0 <= col < cols and grid[row][col] != 0
+        else:
+            data, stride = grid.data, grid.stride
+
+            def open_at(position):
+                return data[(position[0] + 1) * stride + position[1] + 1] != 0
+
+        self.open_at = open_at
+
+    def cell(self, position):
+        return position[0] * self.cols + position[1]
+
+    def position(self, cell):
+        return divmod(cell, self.cols)
+
+    def key(self):
+        # Stable digest of the size and wall layout, for per-board caches.
+        if self._key is None:
+            import hashlib
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(f"{self.rows}x{self.cols}:".encode())
+            digest.update(self.open_cells)
+            self._key = digest.hexdigest()
+        return self._key
+
+    @property
+    def open_cells(self):
+        # One byte per cell id, 1 where a block may stand.
+        if self._open_cells is None:
+            self._open_cells = bytearray(b"".join(
+                bytes(grid_row).translate(OPEN_TABLE) for grid_row in self.grid))
+        return self._open_cells
+
+    @property
+    def slides(self):
+        if self._slides is None:
+            self.build_slides()
+        return self._slides
+
+    @property
+    def reverse_slides(self):
+        # Slides are not reversible, so searching backwards needs the
+        # inverse graph: sources[offsets[cell]:offsets[cell + 1]] are the open
+        # cells whose slide in some direction stops on `cell`.
+        if self._reverse_slides is None:
+            self.build_reverse_slides()
+        return self._reverse_slides
+
+    def build_reverse_slides(self):
+        cells = self.rows * self.cols
+        slides = self.slides
+        open_cells = self.open_cells
+        counts = array("i", bytes(4 * (cells + 1)))
+        for cell in range(cells):
+            if open_cells[cell]:
+                for d in range(4):
+                    stop = slides[cell * 4 + d]
+                    if stop != cell:
+                        counts[stop + 1] += 1
+        for cell in range(cells):
+            counts[cell + 1] += counts[cell]
+        offsets = array("i", counts)
+        sources = array("i", bytes(4 * offsets[cells]))
+        for cell in range(cells):
+            if open_cells[cell]:
+                for d in range(4):
+                    stop = slides[cell * 4 + d]
+                    if stop != cell:
+                        sources[counts[stop]] = cell
+                        counts[stop] += 1
+        self._reverse_slides = (offsets, sources)
+
+    def build_slides(self):
+        # slides[cell * 4 + d] is the cell id (row * cols + col) where a block
+        # standing on `cell` stops when sliding in DIRECTIONS[d].  Every entry
+        # is its open neighbour's entry, so one sweep per direction fills it.
+        # It is built on first use; compact backends keep it in an int array.
+        size = self.rows * self.cols * 4
+        if self.backend == "list":
+            self._slides = [0] * size
+        else:
+            self._slides = array("i", bytes(4 * size))
+        for row in range(self.rows):
+            self._update_row(row)
+        for col in range(self.cols):
+            self._update_col(col)
+
+    def _update_row(self, row):
+        grid_row = self.grid[row]
+        slides = self._slides
+        base = row * self.cols
+        for col in range(self.cols):
+            cell = base + col
+            if col > 0 and grid_row[col - 1] != 0:
+                slides[cell * 4 + 2] = slides[(cell - 1) * 4 + 2]
+            else:
+                slides[cell * 4 + 2] = cell
+        for col in range(self.cols - 1, -1, -1):
+            cell = base + col
+            if col < self.cols - 1 and grid_row[col + 1] != 0:
+                slides[cell * 4 + 3] = slides[(cell + 1) * 4 + 3]
+            else:
+                slides[cell * 4 + 3] = cell
+
+    def _update_col(self, col):
+        grid = self.grid
+        slides = self._slides
+        cols = self.cols
+        for row in range(self.rows):
+            cell = row * cols + col
+            if row > 0 and grid[row - 1][col] != 0:
+                slides[cell * 4] = slides[(cell - cols) * 4]
+            else:
+                slides[cell * 4] = cell
+        for row in range(self.rows - 1, -1, -1):
+            cell = row * cols + col
+            if row < self.rows - 1 and grid[row + 1][col] != 0:
+                slides[cell * 4 + 1] = slides[(cell + cols) * 4 + 1]
+            else:
+                slides[cell * 4 + 1] = cell
+
+    def set_wall(self, row, col, wall=True):
+        # Only the row and column through the changed cell can see a new stop
+        # cell, so the table is patched in O(rows + cols).
+        self.grid[row][col] = 0 if wall else 1
+        if self._open_cells is not None:
+            self._open_cells[row * self.cols + col] = 0 if wall else 1
+        self._reverse_slides = None
+        self._key = None
+        if self._slides is not None:
+            self._update_row(row)
+            self._update_col(col)
+
+    def clear_wall(self, row, col):
+        self.set_wall(row, col, wall=False)
+
+    def slide(self, position, direction):
+        row, col = position
+        cell = self.slides[(row * self.cols + col) * 4 + DIRECTION_INDEX[direction]]
+        return divmod(cell, self.cols)
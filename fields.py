@@ -0,0 +1,91 @@
+from array import array
+from collections import OrderedDict, deque
+
+import search
+
+# Goal distance fields.  One BFS over the reverse move graph from the goal
+# records, for every cell, its move count to the goal and the next cell to
+# step to.  Any later query towards that goal on the same board is then a
+# walk along `next_cell`, O(path length), with no search at all.
+
+REVERSE_MODELS = {"step": search.step_moves, "slide": search.reverse_slide_moves}
+
+
+class DistanceField:
+    def __init__(self, board, goal, model="step"):
+        self.board = board
+        self.goal = goal
+        self.model = model
+        cells = board.rows * board.cols
+        self.distance = array("i", [-1]) * cells
+        self.next_cell = array("i", [-1]) * cells
+
+        goal_cell = board.cell(goal)
+        if not board.open_cells[goal_cell]:
+            # Nothing reaches a wall; the reverse BFS would step out of it.
+            return
+        reverse_moves = REVERSE_MODELS[model](board)
+        self.distance[goal_cell] = 0
+        self.next_cell[goal_cell] = goal_cell
+        queue = deque([goal_cell])
+        while queue:
+            current = queue.popleft()
+            next_distance = self.distance[current] + 1
+            for previous in reverse_moves(current):
+                if self.distance[previous] < 0:
+                    self.distance[previous] = next_distance
+                    self.next_cell[previous] = current
+                    queue.append(previous)
+
+    def moves_to_goal(self, start):
+        return self.distance[self.board.cell(start)]
+
+    def path(self, start):
+        cell = self.board.cell(start)
+        if self.distance[cell] < 0:
+            return []
+        path = [start]
+        while self.distance[cell] > 0:
+            cell = self.next_cell[cell]
+            path.append(self.board.position(cell))
+        return path
+
+
+class FieldCache:
+    def __init__(self, size=64):
+        self.size = size
+        self.fields = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def field(self, board, goal, model="step"):
+        key = (board.key(), tuple(goal), model)
+        field = self.fields.get(key)
+        if field is not None:
+            self.hits += 1
+            self.fields.move_to_end(key)
+            return field
+
+        self.misses += 1
+        field = DistanceField(board, goal, model)
+        self.fields[key] = field
+        if len(self.fields) > self.size:
+            self.fields.popitem(last=False)
+            self.evictions += 1
+        return field
+
+    def path(self, board, start, goal, model="step"):
+        if not search.on_board(board, start, goal):
+            return []
+        return self.field(board, goal, model).path(start)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "size": len(self.fields)}
+
+    def clear(self):
+        self.fields.clear()
+
+
+cache = FieldCache()
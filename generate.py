@@ -0,0 +1,158 @@
+import argparse
+import os
+import random
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import levelpack
+import levels
+import search
+
+# Random level generator.  Wall layouts are sampled a batch at a time (with
+# NumPy when it is installed), and each layout gets one slide BFS from a
+# random start.  That single pass is both the solvability check and the
+# difficulty measure: the goal is drawn only from cells whose optimal move
+# count lies in [min_moves, max_moves], and layouts with no such cell are
+# dropped.  Two-block levels are checked with the joint solver from mine.py.
+
+
+def parse_sizes(text):
+    sizes = []
+    for item in text.split(","):
+        rows, _, cols = item.partition("x")
+        sizes.append((int(rows), int(cols or rows)))
+    return sizes
+
+
+def sample_layouts(rng, count, rows, cols, density):
+    # Returns `count` layouts as lists of row strings with a wall border.
+    if np is not None:
+        walls = np.random.default_rng(rng.getrandbits(64)).random((count, rows, cols)) < density
+        walls[:, 0, :] = walls[:, -1, :] = True
+        walls[:, :, 0] = walls[:, :, -1] = True
+        cells = np.where(walls, ord("#"), ord(".")).astype(np.uint8)
+        return [[bytes(row).decode("ascii") for row in layout] for layout in cells]
+
+    layouts = []
+    border = "#" * cols
+    for _ in range(count):
+        grid = [border]
+        for _ in range(rows - 2):
+            inner = "".join("#" if rng.random() < density else "." for _ in range(cols - 2))
+            grid.append("#" + inner + "#")
+        grid.append(border)
+        layouts.append(grid)
+    return layouts
+
+
+def single_block_level(rng, grid, min_moves, max_moves):
+    board = levels.level_board({"grid": grid})
+    open_cells = [cell for cell, value in enumerate(board.open_cells) if value]
+    if len(open_cells) < 2:
+        return None
+    start = rng.choice(open_cells)
+    distance = search.distances(board, start, search.slide_moves(board))
+    goals = [cell for cell in open_cells if min_moves <= distance[cell] <= max_moves]
+    if not goals:
+        return None
+    goal = rng.choice(goals)
+    return {"grid": grid, "start": board.position(start), "goal": board.position(goal),
+            "moves": distance[goal]}
+
+
+def two_block_level(rng, grid, min_moves, max_moves, attempts=4):
+    import mine
+    board = levels.level_board({"grid": grid})
+    open_cells = [board.position(cell) for cell, value in enumerate(board.open_cells) if value]
+    if len(open_cells) < 4:
+        return None
+    for _ in range(attempts):
+        start1, goal1, start2, goal2 = rng.sample(open_cells, 4)
+        moves = mine.State(board, [start1, start2], [goal1, goal2]).solve()
+        if moves is not None and min_moves <= len(moves) <= max_moves:
+            return {"grid": grid, "start": start1, "goal": goal1,
+                    "start2": start2, "goal2": goal2, "moves": len(moves)}
+    return None
+
+
+def generate_batch(seed, count, sizes, density, blocks, min_moves, max_moves):
+    # Runs in a worker: samples `count` layouts and returns the ones kept.
+    rng = random.Random(seed)
+    rows, cols = rng.choice(sizes)
+    make_level = two_block_level if blocks == 2 else single_block_level
+    found = []
+    for grid in sample_layouts(rng, count, rows, cols, density):
+        level = make_level(rng, grid, min_moves, max_moves)
+        if level is not None:
+            found.append(level)
+    return found
+
+
+def generate(target, sizes, density=0.25, blocks=1, min_moves=3, max_moves=30,
+             seed=0, batch=256, workers=None, backlog=2):
+    # Yields verified levels until `target` of them have been produced.
+    workers = workers or os.cpu_count() or 1
+    seeds = random.Random(seed)
+    arguments = (sizes, density, blocks, min_moves, max_moves)
+    produced = 0
+
+    if workers == 1:
+        while produced < target:
+            for level in generate_batch(seeds.getrandbits(64), batch, *arguments):
+                if produced < target:
+                    produced += 1
+                    yield level
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = {pool.submit(generate_batch, seeds.getrandbits(64), batch, *arguments)
+                   for _ in range(workers * backlog)}
+        while produced < target:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                for level in future.result():
+                    if produced < target:
+                        produced += 1
+                        yield level
+                running.add(pool.submit(generate_batch, seeds.getrandbits(64), batch, *arguments))
+        for future in running:
+            future.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate solvable Zero Squares levels.")
+    parser.add_argument("count", type=int)
+    parser.add_argument("--output", default="-",
+                        help="text level file, a .zsq level pack, or - for stdout")
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes("10x10,20x20,30x30"))
+    parser.add_argument("--density", type=float, default=0.25)
+    parser.add_argument("--blocks", type=int, choices=(1, 2), default=1)
+    parser.add_argument("--min-moves", type=int, default=3)
+    parser.add_argument("--max-moves", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch", type=int, default=256, help="layouts sampled per task")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    produced = generate(args.count, args.sizes, args.density, args.blocks,
+                        args.min_moves, args.max_moves, args.seed, args.batch, args.workers)
+    if args.output.endswith(".zsq"):
+        with levelpack.PackWriter(args.output) as writer:
+            for level in produced:
+                writer.write(level)
+    elif args.output == "-":
+        for level in produced:
+            sys.stdout.write(levels.format_level(level) + "\n")
+    else:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            for level in produced:
+                stream.write(levels.format_level(level) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import struct
+import sys
+import zlib
+from array import array
+from collections import deque
+from itertools import permutations, product
+
+# Retrograde hint tables for the block game (mine.State).  One backward BFS
+# from every finished position fills in, for each joint state that can still
+# be finished, its distance to the finish and the direction that starts a
+# shortest solution.  Both are packed into one uint32 per state,
+# distance << 2 | direction, indexed by the block cells read as digits in
+# base rows * cols, so a hint during play is one array read.  States that can
+# no longer be finished hold UNSOLVABLE.
+#
+# Without collisions a block moves on its own, so the joint predecessors of a
+# state under direction d are the product of each block's predecessor cells
+# and the table is built without a forward pass.  Solid blocks have no such
+# reverse move, so only the non-colliding game gets a table.
+#
+# Serialised form: "ZSQHINT1", u32 cells, u32 blocks, then the entries as
+# little-endian u32, zlib-compressed.
+
+DIRECTIONS = ["up", "down", "left", "right"]
+UNSOLVABLE = 0xFFFFFFFF
+MAX_STATES = 1 << 24
+MAGIC = b"ZSQHINT1"
+HEADER = struct.Struct("<8sII")
+
+
+class HintTable:
+    def __init__(self, cells, blocks, entries):
+        self.cells = cells
+        self.blocks = blocks
+        self.entries = entries
+
+    def index(self, block_cells):
+        key = 0
+        for cell in block_cells:
+            key = key * self.cells + cell
+        return key
+
+    def lookup(self, block_cells):
+        # (moves left, best direction), (0, None) once finished, or None when
+        # the game can no longer be finished from here.
+        entry = self.entries[self.index(block_cells)]
+        if entry == UNSOLVABLE:
+            return None
+        if entry < 4:
+            return 0, None
+        return entry >> 2, DIRECTIONS[entry & 3]
+
+    def to_bytes(self):
+        entries = self.entries
+        if sys.byteorder != "little":
+            entries = array("I", entries)
+            entries.byteswap()
+        return HEADER.pack(MAGIC, self.cells, self.blocks) + zlib.compress(entries.tobytes())
+
+
+def from_bytes(data):
+    magic, cells, blocks = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a hint table")
+    entries = array("I")
+    entries.frombytes(zlib.decompress(data[HEADER.size:]))
+    if sys.byteorder != "little":
+        entries.byteswap()
+    if len(entries) != cells ** blocks:
+        raise ValueError("hint table is truncated")
+    return HintTable(cells, blocks, entries)
+
+
+def build(state):
+    if state.collide:
+        raise ValueError("hint tables need the non-colliding block game")
+    board = state.board
+    cells = board.rows * board.cols
+    count = len(state.cells)
+    if cells ** count > MAX_STATES:
+        raise ValueError(f"{cells ** count} joint states is too many for a hint table")
+    stop = board.slides
+    open_cells = board.open_cells
+
+    # sources[i][d][cell]: cells block i can stand on so that a move in
+    # direction d leaves it on `cell`.  A parked block stays where it is.
+    sources = []
+    for parking in state.parking:
+        by_direction = []
+        for d in range(4):
+            lists = [[] for _ in range(cells)]
+            for cell in range(cells):
+                if open_cells[cell]:
+                    lists[cell if cell in parking else stop[cell * 4 + d]].append(cell)
+            by_direction.append(lists)
+        sources.append(by_direction)
+
+    table = HintTable(cells, count, array("I", [UNSOLVABLE]) * (cells ** count))
+    entries = table.entries
+
+    # Finished states: each group's goals handed out to its blocks in every
+    # order, since interchangeable blocks may finish on any of them.
+    members = {}
+    for i, group in enumerate(state.groups):
+        members.setdefault(group, []).append(i)
+    goal_cells = [board.cell(goal) for goal in state.goals]
+    queue = deque()
+    for orders in product(*(permutations(blocks) for blocks in members.values())):
+        finished = [0] * count
+        for blocks, order in zip(members.values(), orders):
+            for block, source in zip(blocks, order):
+                finished[block] = goal_cells[source]
+        key = table.index(finished)
+        if entries[key] == UNSOLVABLE:
+            entries[key] = 0
+            queue.append(key)
+
+    block_cells = [0] * count
+    while queue:
+        key = queue.popleft()
+        distance = (entries[key] >> 2) + 1
+        rest = key
+        for i in range(count - 1, -1, -1):
+            rest, block_cells[i] = divmod(rest, cells)
+        for d in range(4):
+            keys = [0]
+            for i in range(count):
+                keys = [prefix * cells + cell for prefix in keys for cell in sources[i][d][block_cells[i]]]
+            for previous_key in keys:
+                if entries[previous_key] == UNSOLVABLE:
+                    entries[previous_key] = distance << 2 | d
+                    queue.append(previous_key)
+    return table
@@ -0,0 +1,64 @@
+# Undo/redo for the game states.  A History is a list of snapshots with a
+# cursor; a game pushes one immutable snapshot (a position tuple, or a tuple
+# of block cells) per move, so undo, redo and jumping to any earlier step
+# only move the cursor.  Pushing after an undo drops the redo tail, which
+# costs O(1) amortised since every snapshot is dropped at most once.
+
+
+class History:
+    def __init__(self, snapshot):
+        self.snapshots = [snapshot]
+        self.index = 0
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    @property
+    def current(self):
+        return self.snapshots[self.index]
+
+    def can_undo(self):
+        return self.index > 0
+
+    def can_redo(self):
+        return self.index < len(self.snapshots) - 1
+
+    def push(self, snapshot):
+        self.index += 1
+        del self.snapshots[self.index:]
+        self.snapshots.append(snapshot)
+
+    def undo(self):
+        # The snapshot to restore; the first one again if there is nothing
+        # left to undo.
+        if self.index > 0:
+            self.index -= 1
+        return self.snapshots[self.index]
+
+    def redo(self):
+        if self.index < len(self.snapshots) - 1:
+            self.index += 1
+        return self.snapshots[self.index]
+
+    def seek(self, index):
+        if not 0 <= index < len(self.snapshots):
+            raise IndexError("history index out of range")
+        self.index = index
+        return self.snapshots[index]
+
+
+class PositionHistory:
+    # undo/redo/replay for the single-block States, which keep `position`,
+    # a History of positions, move_to_max() and check_goal().
+    def undo(self):
+        self.position = self.history.undo()
+
+    def redo(self):
+        self.position = self.history.redo()
+
+    def replay(self, moves):
+        # Plays a list of directions from the current position and tells
+        # whether it ends on the goal; every step lands in the history.
+        for direction in moves:
+            self.move_to_max(direction)
+        return self.check_goal()
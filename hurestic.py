@@ -1,46 +1,17 @@
-import tkinter as tk
-from tkinter import messagebox
-import heapq
-
-class Board:
-    def __init__(self, rows, cols):
-        self.rows = rows
-        self.cols = cols
-        self.grid = self.initialize_grid()
-
-    def initialize_grid(self):
-        grid = [[1 for _ in range(self.cols)] for _ in range(self.rows)]
-
-        for i in range(self.rows):
-            grid[i][0] = 0
-            grid[i][self.cols - 1] = 0
-        for j in range(self.cols):
-            grid[0][j] = 0
-            grid[self.rows - 1][j] = 0
-
-        manual_walls = [
-            (1, 3), (2, 3), (3, 3), (4, 3),
-            (5, 2), (5, 3), (5, 4),
-            (7, 6), (6, 6), (5, 6), (4, 6),
-            (3, 8), (4, 8), (5, 8),
-            (2, 5), (6, 2), (8, 4)
-        ]
-
-        for (i, j) in manual_walls:
-            grid[i][j] = 0
-
-        grid[1][1] = 1
-        grid[self.rows - 2][self.cols - 2] = 1
-
-        return grid
-
-
-class State:
+from board import Board
+import history
+import render
+import search
+import tasks
+import landmarks
+
+class State(history.PositionHistory):
     def __init__(self, board: Board, start: tuple, goal: tuple):
         self.board = board
         self.start = start
         self.goal = goal
         self.position = start
+        self.history = history.History(start)
         self.visited = set()
         self.path = []
 
@@ -48,10 +19,13 @@ class State:
         return self.position == self.goal
 
     def is_valid(self, position):
-        row, col = position
-        return (0 <= row < self.board.rows and
-                0 <= col < self.board.cols and
-                self.board.grid[row][col] == 1)
+        return self.board.is_open(*position)
+
+    def move_to_max(self, direction):
+        position = self.board.slide(self.position, direction)
+        if position != self.position:
+            self.position = position
+            self.history.push(position)
 
     def heuristic(self, position):
         row, col = position
@@ -59,31 +33,21 @@ class State:
         # Manhattan distance as the heuristic
         return abs(row - goal_row) + abs(col - goal_col)
 
-    def astar(self):
-        open_list = []
-        closed_list = set()
-
-        # A* uses a priority queue
-        heapq.heappush(open_list, (0 + self.heuristic(self.start), 0, self.start, []))
-        
-        while open_list:
-            _, cost, current, path = heapq.heappop(open_list)
-
-            if current in closed_list:
-                continue
-            
-            closed_list.add(current)
-            new_path = path + [current]
-            
-            if current == self.goal:
-                return new_path
-
-            neighbors = self.get_neighbors(current)
-            for neighbor in neighbors:
-                if neighbor not in closed_list and self.is_valid(neighbor):
-                    heapq.heappush(open_list, (cost + 1 + self.heuristic(neighbor), cost + 1, neighbor, new_path))
-
-        return []
+    def astar(self, engine="astar", stats=None, table_size=search.TABLE_SIZE, store=None):
+        # engine="ida" runs in memory proportional to the path length.
+        # A solutions.SolutionStore in `store` keeps answers across runs.
+        if store is not None:
+            return store.path(self.board, self.start, self.goal,
+                              lambda: self.astar(engine, stats, table_size))
+        if engine == "ida":
+            return search.ida_star(self.board, self.start, self.goal,
+                                   table_size=table_size, stats=stats)
+        if engine == "jps":
+            return search.jps(self.board, self.start, self.goal, stats)
+        if engine == "alt":
+            table = landmarks.landmark_table(self.board)
+            return search.astar(self.board, self.start, self.goal, table.heuristic(self.goal), stats=stats)
+        return search.astar(self.board, self.start, self.goal, stats=stats)
 
     def get_neighbors(self, position):
         row, col = position
@@ -95,8 +59,9 @@ class State:
         ]
 
 
-class GameGUI:
+class GameGUI(tasks.SearchMixin):
     def __init__(self, root, state):
+        import tkinter as tk
         self.root = root
         self.state = state
         self.cell_size = 40
@@ -110,32 +75,35 @@ class GameGUI:
         self.reset_button = tk.Button(root, text="إعادة اللعب", command=self.reset_game)
         self.reset_button.pack()
 
+        self.undo_button = tk.Button(root, text="تراجع", command=self.undo_move)
+        self.undo_button.pack()
+
+        self.redo_button = tk.Button(root, text="إعادة الخطوة", command=self.redo_move)
+        self.redo_button.pack()
+
+        self.cells = render.BoardCanvas(self.canvas, self.state.board, self.cell_size)
+        self.task = None
         self.draw_board()
         self.root.bind("<Key>", self.handle_keypress)
 
     def draw_board(self):
-        self.canvas.delete("all")
-        for i in range(self.state.board.rows):
-            for j in range(self.state.board.cols):
-                x1, y1 = j * self.cell_size, i * self.cell_size
-                x2, y2 = x1 + self.cell_size, y1 + self.cell_size
-
-                if (i, j) == self.state.start:
-                    color = "green"
-                elif (i, j) == self.state.goal:
-                    color = "red"
-                elif (i, j) == self.state.position:
-                    color = "blue"
-                elif (i, j) in self.state.path:
-                    color = "yellow"
-                elif self.state.board.grid[i][j] == 0:
-                    color = "black"
-                else:
-                    color = "white"
-
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="gray")
+        board = self.state.board
+        overlay = {board.cell(position): "yellow" for position in self.state.path}
+        overlay[board.cell(self.state.position)] = "blue"
+        overlay[board.cell(self.state.goal)] = "red"
+        overlay[board.cell(self.state.start)] = "green"
+        self.cells.show(overlay)
+
+    def undo_move(self):
+        self.state.undo()
+        self.draw_board()
+
+    def redo_move(self):
+        self.state.redo()
+        self.draw_board()
 
     def handle_keypress(self, event):
+        from tkinter import messagebox
         direction = None
         if event.keysym == "Up":
             direction = "up"
@@ -145,6 +113,10 @@ class GameGUI:
             direction = "left"
         elif event.keysym == "Right":
             direction = "right"
+        elif event.keysym == "z":
+            self.undo_move()
+        elif event.keysym == "y":
+            self.redo_move()
 
         if direction:
             self.state.move_to_max(direction)
@@ -156,7 +128,12 @@ class GameGUI:
                 return
 
     def run_astar(self):
-        self.state.path = self.state.astar()
+        state = self.state
+        self.start_search(lambda stats: state.astar(stats=stats), self.finish_astar)
+
+    def finish_astar(self, path):
+        from tkinter import messagebox
+        self.state.path = path
         self.draw_board()
         if self.state.path and self.state.path[-1] == self.state.goal:
             messagebox.showinfo("نجاح", "تم العثور على الهدف باستخدام A*!")
@@ -164,14 +141,18 @@ class GameGUI:
             messagebox.showinfo("فشل", "لا يوجد مسار إلى الهدف!")
 
     def reset_game(self):
+        self.cancel_search()
         board = Board(10, 10)
         start = (1, 1)
         goal = (8, 8)
         self.state = State(board, start, goal)
+        self.cells.set_board(self.state.board)
         self.draw_board()
 
 
 if __name__ == "__main__":
+    import tkinter as tk
+
     board = Board(10, 10)
     start = (1, 1)
     goal = (8, 8)
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+
+import search
+
+# ALT heuristic tables.  For each landmark L we keep exact move counts
+# L -> v and v -> L for every cell v; the triangle inequality then gives
+#     d(v, goal) >= d(v, L) - d(goal, L)   and   d(v, goal) >= d(L, goal) - d(L, v)
+# which is far tighter than Manhattan distance on walled boards.  Tables are
+# built once per (board key, landmark count, move model) and kept in a small
+# LRU cache.
+
+CACHE_SIZE = 32
+_tables = OrderedDict()
+
+
+class LandmarkTable:
+    def __init__(self, board, count=4, model="step"):
+        self.board = board
+        self.model = model
+        moves = search.MOVE_MODELS[model](board)
+        if model == "slide":
+            reverse_moves = search.reverse_slide_moves(board)
+        else:
+            reverse_moves = moves
+        self.landmarks = []
+        self.distance_from = []
+        self.distance_to = []
+
+        open_cells = board.open_cells
+        seed = next((cell for cell in range(len(open_cells)) if open_cells[cell]), None)
+        if seed is None:
+            return
+
+        # Farthest-point selection: each new landmark is the cell farthest
+        # (in moves) from every landmark picked so far.
+        nearest = search.distances(board, seed, moves)
+        for _ in range(count):
+            landmark = max(range(len(nearest)), key=nearest.__getitem__)
+            if nearest[landmark] <= 0 and self.landmarks:
+                break
+            distance_from = search.distances(board, landmark, moves)
+            self.landmarks.append(landmark)
+            self.distance_from.append(distance_from)
+            self.distance_to.append(
+                distance_from if reverse_moves is moves
+                else search.distances(board, landmark, reverse_moves))
+            for cell, distance in enumerate(distance_from):
+                if distance >= 0 and (nearest[cell] < 0 or distance < nearest[cell]):
+                    nearest[cell] = distance
+            nearest[landmark] = 0
+
+    def heuristic(self, goal):
+        goal_cell = self.board.cell(goal)
+        bounds = []
+        for distance_from, distance_to in zip(self.distance_from, self.distance_to):
+            bounds.append((distance_from, distance_to, distance_from[goal_cell], distance_to[goal_cell]))
+
+        def heuristic(cell):
+            best = 0
+            for distance_from, distance_to, from_goal, to_goal in bounds:
+                to_landmark = distance_to[cell]
+                if to_landmark >= 0 and to_goal >= 0 and to_landmark - to_goal > best:
+                    best = to_landmark - to_goal
+                from_landmark = distance_from[cell]
+                if from_landmark >= 0 and from_goal >= 0 and from_goal - from_landmark > best:
+                    best = from_goal - from_landmark
+            return best
+
+        return heuristic
+
+
+def landmark_table(board, count=4, model="step"):
+    key = (board.key(), count, model)
+    table = _tables.get(key)
+    if table is None:
+        table = LandmarkTable(board, count, model)
+        _tables[key] = table
+        if len(_tables) > CACHE_SIZE:
+            _tables.popitem(last=False)
+    else:
+        _tables.move_to_end(key)
+        table.board = board
+    return table
@@ -0,0 +1,183 @@
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+
+import levels
+
+# Binary level packs.
+#
+#   header   "ZSQPACK1", u32 version, u32 level count, u64 index offset
+#   levels   one record per level, back to back
+#   index    u64 file offset of every record, in level order
+#
+# A record is u16 rows, u16 cols, u8 block count, i32 moves (the level's
+# optimal move count, -1 when unknown), then (start row, start col, goal
+# row, goal col) as u16 per block, then the walls as rows * ceil(cols/8)
+# bytes, one bit per cell (1 = wall), most significant bit first and every
+# row padded to a whole byte.  All integers are little-endian.  The index is
+# written last so a pack can be streamed out without knowing its size, and a
+# reader memory-maps the file and decodes only the level it is asked for.
+# Version 1 records have no moves field and are still read.
+
+MAGIC = b"ZSQPACK1"
+VERSION = 2
+HEADER = struct.Struct("<8sIIQ")
+RECORD = struct.Struct("<HHBi")
+RECORDS = {1: struct.Struct("<HHB"), 2: RECORD}
+POINT = struct.Struct("<HHHH")
+OFFSET = struct.Struct("<Q")
+
+
+def row_bytes(cols):
+    return (cols + 7) // 8
+
+
+def encode_level(level):
+    grid = level["grid"]
+    rows, cols = len(grid), len(grid[0]) if grid else 0
+    blocks = levels.level_blocks(level)
+
+    parts = [RECORD.pack(rows, cols, len(blocks), level.get("moves", -1))]
+    for start, goal in blocks:
+        parts.append(POINT.pack(start[0], start[1], goal[0], goal[1]))
+    width = row_bytes(cols)
+    for line in grid:
+        bits = "".join("1" if char == "#" else "0" for char in line).ljust(width * 8, "0")
+        parts.append(int(bits, 2).to_bytes(width, "big") if width else b"")
+    return b"".join(parts)
+
+
+def decode_level(buffer, offset, version=VERSION):
+    record = RECORDS[version]
+    rows, cols, blocks, *moves = record.unpack_from(buffer, offset)
+    offset += record.size
+    level = {}
+    for block in range(blocks):
+        start_row, start_col, goal_row, goal_col = POINT.unpack_from(buffer, offset)
+        offset += POINT.size
+        start_key, goal_key = levels.block_keys(block)
+        level[start_key] = (start_row, start_col)
+        level[goal_key] = (goal_row, goal_col)
+
+    width = row_bytes(cols)
+    grid = []
+    for _ in range(rows):
+        bits = int.from_bytes(buffer[offset:offset + width], "big")
+        grid.append(format(bits, f"0{width * 8}b")[:cols].replace("0", ".").replace("1", "#"))
+        offset += width
+    level["grid"] = grid
+    if moves and moves[0] >= 0:
+        level["moves"] = moves[0]
+    return level
+
+
+class PackWriter:
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.offsets = array("Q")
+        self.file.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+
+    def write(self, level):
+        self.offsets.append(self.file.tell())
+        self.file.write(encode_level(level))
+
+    def close(self):
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        for offset in self.offsets:
+            self.file.write(OFFSET.pack(offset))
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, len(self.offsets), index_offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class LevelPack:
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, self.count, self.index_offset = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a level pack")
+        if self.version not in RECORDS:
+            raise ValueError(f"unsupported level pack version {self.version}")
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("level index out of range")
+        offset, = OFFSET.unpack_from(self.buffer, self.index_offset + index * OFFSET.size)
+        return decode_level(self.buffer, offset, self.version)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def board(self, index, backend="list"):
+        return levels.level_board(self[index], backend)
+
+    def close(self):
+        self.buffer.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def import_text(stream, path):
+    count = 0
+    with PackWriter(path) as writer:
+        for level in levels.read_levels(stream):
+            writer.write(level)
+            count += 1
+    return count
+
+
+def export_text(path, stream):
+    with LevelPack(path) as pack:
+        for level in pack:
+            stream.write(levels.format_level(level) + "\n")
+        return len(pack)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert between text levels and level packs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    to_pack = commands.add_parser("import", help="text levels -> pack")
+    to_pack.add_argument("text", help="text level file, or - for stdin")
+    to_pack.add_argument("pack")
+    to_text = commands.add_parser("export", help="pack -> text levels")
+    to_text.add_argument("pack")
+    to_text.add_argument("text", nargs="?", default="-", help="output file, or - for stdout")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        if args.text == "-":
+            import_text(sys.stdin, args.pack)
+        else:
+            with open(args.text, encoding="utf-8") as stream:
+                import_text(stream, args.pack)
+    elif args.text == "-":
+        export_text(args.pack, sys.stdout)
+    else:
+        with open(args.text, "w", encoding="utf-8") as stream:
+            export_text(args.pack, stream)
+
+
+if __name__ == "__main__":
+    main()
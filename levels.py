@@ -0,0 +1,55 @@
+import json
+
+from board import Board
+
+# Text level format: one JSON object per line,
+#     {"grid": ["#####", "#...#", ...], "start": [1, 1], "goal": [3, 3]}
+# with "start2"/"goal2", "start3"/"goal3", ... added for multi-block levels
+# and an optional "moves" (known optimal move count).  "#" marks a wall and every other character an
+# open cell.
+
+
+def block_keys(block):
+    suffix = str(block + 1) if block else ""
+    return "start" + suffix, "goal" + suffix
+
+
+def level_blocks(level):
+    # [(start, goal)] for every block, in order.
+    blocks = []
+    start_key, goal_key = block_keys(0)
+    while start_key in level:
+        blocks.append((level[start_key], level[goal_key]))
+        start_key, goal_key = block_keys(len(blocks))
+    return blocks
+
+
+def parse_level(line):
+    level = json.loads(line)
+    for key, value in level.items():
+        if key.startswith(("start", "goal")):
+            level[key] = tuple(value)
+    return level
+
+
+def format_level(level):
+    record = {"grid": level["grid"]}
+    for block in range(len(level_blocks(level))):
+        for key in block_keys(block):
+            record[key] = list(level[key])
+    if "moves" in level:
+        record["moves"] = level["moves"]
+    return json.dumps(record, separators=(",", ":"))
+
+
+def level_board(level, backend="list"):
+    grid = level["grid"]
+    return Board(len(grid), len(grid[0]) if grid else 0, backend, layout=grid)
+
+
+def read_levels(stream):
+    # Lazily yields levels so huge inputs never sit in memory at once.
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("//"):
+            yield parse_level(line)
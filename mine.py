@@ -1,109 +1,291 @@
-import tkinter as tk
-from tkinter import messagebox
-
-class Board:
-    def __init__(self, rows, cols):
-        self.rows = rows
-        self.cols = cols
-        self.grid = self.initialize_grid()
-
-    def initialize_grid(self):
-        grid = [[1 for _ in range(self.cols)] for _ in range(self.rows)]
-        
-        
-        for i in range(self.rows):
-            grid[i][0] = 0
-            grid[i][self.cols - 1] = 0
-        for j in range(self.cols):
-            grid[0][j] = 0
-            grid[self.rows - 1][j] = 0
-        
-        manual_walls = [
-            (1, 3), (2, 3), (3, 3), (4, 3),  
-            (5, 2), (5, 3), (5, 4),  
-            (7, 6), (6, 6), (5, 6), (4, 6), 
-            (3, 8), (4, 8), (5, 8),  
-            (2, 5), (6, 2), (8, 4)   
-        ]
-        
-        for (i, j) in manual_walls:
-            grid[i][j] = 0
-        
-        return grid
+from array import array
+from collections import deque
+from operator import getitem
+
+from board import Board
+import hints
+import history
+import reach
+import render
+import search
+
+DIRECTIONS = ["up", "down", "left", "right"]
+
+# Block colours for the GUI, one tuple per group:
+# (block, start, goal, trail).
+BLOCK_COLORS = [("red", "#ff7f7f", "#ff4c4c", "yellow"),
+                ("blue", "#7fbfff", "#4cafff", "cyan"),
+                ("green", "#7fdf7f", "#3fbf3f", "#c8f0c8"),
+                ("purple", "#bf7fdf", "#9f3fbf", "#ecc8f7"),
+                ("orange", "#ffbf7f", "#ff9f3f", "#ffe2c2")]
+
+ARROWS = {"up": "↑", "down": "↓", "left": "←", "right": "→"}
 
 class State:
-    def __init__(self, board: Board, start1: tuple, goal1: tuple, start2: tuple, goal2: tuple):
+    # k blocks that all slide together on every move.  starts[i] and
+    # goals[i] belong to block i; blocks with the same groups[i] are
+    # interchangeable, so any of them may finish on any goal of the group.
+    # A block standing on a goal of its group is parked and no longer moves.
+    # With collide=True blocks are solid: a block stops in front of a
+    # parked block or of one that has already stopped ahead of it.
+    #
+    # The Board only holds walls and is never written to.  Block positions
+    # live in `cells` (cell ids) and every cell a block has stopped on is a
+    # 1 in its `trails` bytearray, so moves can be simulated on a shared
+    # Board without copying it.  Each move pushes (block cells, blocks whose
+    # trail byte it newly set) onto `history`, which is all undo needs.
+    def __init__(self, board: Board, starts, goals, groups=None, collide=False):
         self.board = board
-        self.start1 = start1
-        self.goal1 = goal1
-        self.start2 = start2
-        self.goal2 = goal2
-        self.position1 = start1
-        self.position2 = start2
-        self.game_over = False  
+        self.starts = [tuple(start) for start in starts]
+        self.goals = [tuple(goal) for goal in goals]
+        self.groups = list(groups) if groups is not None else list(range(len(self.starts)))
+        if not len(self.starts) == len(self.goals) == len(self.groups):
+            raise ValueError("every block needs one start, one goal and one group")
+        self.collide = collide
+        self.cells = [board.cell(start) for start in self.starts]
+        cells = board.rows * board.cols
+        self.trails = [bytearray(cells) for _ in self.cells]
+        group_goals = {}
+        for group, goal in zip(self.groups, self.goals):
+            group_goals.setdefault(group, set()).add(board.cell(goal))
+        self.parking = [group_goals[group] for group in self.groups]
+        self.target = sorted((group, board.cell(goal)) for group, goal in zip(self.groups, self.goals))
+        self.game_over = self.finished()
+        self.history = history.History((tuple(self.cells), ()))
+
+    @property
+    def positions(self):
+        return [self.board.position(cell) for cell in self.cells]
 
     def check(self, direction, position):
-        
+        # position is a block's cell, so its neighbour is at most one step
+        # off the board and the unchecked board.open_at is safe.
         row, col = position
+        open_at = self.board.open_at
         if direction == "up":
-            return self.is_valid_position((row - 1, col))
+            return open_at((row - 1, col))
         elif direction == "down":
-            return self.is_valid_position((row + 1, col))
+            return open_at((row + 1, col))
         elif direction == "left":
-            return self.is_valid_position((row, col - 1))
+            return open_at((row, col - 1))
         elif direction == "right":
-            return self.is_valid_position((row, col + 1))
+            return open_at((row, col + 1))
         return False
 
     def is_valid_position(self, position):
-        row, col = position
-        if 0 <= row < self.board.rows and 0 <= col < self.board.cols:
-            return self.board.grid[row][col] != 0
-        return False
+        return self.board.is_open(*position)
+
+    def slide_cells(self, cells, d, parking):
+        # New cell of every block after one move in direction d.  cells and
+        # parking (the goal cells each block parks on) are in the same order.
+        stop = self.board.slides
+        moved = list(cells)
+        if not self.collide:
+            for i, cell in enumerate(cells):
+                if cell not in parking[i]:
+                    moved[i] = stop[cell * 4 + d]
+            return moved
+
+        # Blocks move front first, so everything ahead of a block in its row
+        # or column has already settled when it slides.
+        cols = self.board.cols
+        step = (-cols, cols, -1, 1)[d]
+        settled = [cell for i, cell in enumerate(cells) if cell in parking[i]]
+        for i in sorted(range(len(cells)), key=cells.__getitem__, reverse=step > 0):
+            cell = cells[i]
+            if cell in parking[i]:
+                continue
+            end = stop[cell * 4 + d]
+            for other in settled:
+                if (other % cols == cell % cols) if d < 2 else (other // cols == cell // cols):
+                    if 0 < (other - cell) // step <= (end - cell) // step:
+                        end = other - step
+            moved[i] = end
+            settled.append(end)
+        return moved
 
-    def move(self, direction, player):
+    def finished(self):
+        # Every goal covered by a block of its group.
+        return sorted(zip(self.groups, self.cells)) == self.target
+
+    def move(self, direction):
         if self.game_over:
-            return
+            return self
 
-        if player == 1:
-            row, col = self.position1
-        else:
-            row, col = self.position2
-        
-        
-        while True:
-            if direction == "up":
-                new_position = (row - 1, col)
-            elif direction == "down":
-                new_position = (row + 1, col)
-            elif direction == "left":
-                new_position = (row, col - 1)
-            elif direction == "right":
-                new_position = (row, col + 1)
-
-            if self.is_valid_position(new_position):
-                row, col = new_position
-            else:
-                break
-        
-        
-        if player == 1:
-            self.position1 = (row, col)
-            self.board.grid[row][col] = 2  
-        else:
-            self.position2 = (row, col)
-            self.board.grid[row][col] = 3 
+        cells = self.slide_cells(self.cells, DIRECTIONS.index(direction), self.parking)
+        if cells == self.cells:
+            return self
+        self.cells = cells
+        fresh = []
+        for i, cell in enumerate(cells):
+            if not self.trails[i][cell]:
+                self.trails[i][cell] = 1
+                fresh.append(i)
+        self.history.push((tuple(cells), tuple(fresh)))
+        self.game_over = self.finished()
+        return self
 
-        
-        if player == 1 and self.position1 == self.goal1:
-            self.game_over = self.position2 == self.goal2  
-        elif player == 2 and self.position2 == self.goal2:
-            self.game_over = self.position1 == self.goal1  
+    def undo(self):
+        if self.history.can_undo():
+            cells, fresh = self.history.current
+            for i in fresh:
+                self.trails[i][cells[i]] = 0
+            self.cells = list(self.history.undo()[0])
+            self.game_over = self.finished()
+        return self
 
+    def redo(self):
+        if self.history.can_redo():
+            cells, fresh = self.history.redo()
+            for i in fresh:
+                self.trails[i][cells[i]] = 1
+            self.cells = list(cells)
+            self.game_over = self.finished()
         return self
 
+    def replay(self, moves):
+        # Plays a list of directions (as returned by solve) and tells whether
+        # it finishes the game; every step lands in the history.
+        for direction in moves:
+            self.move(direction)
+        return self.game_over
+
+    def solve(self, stats=None):
+        # Breadth-first search over the joint space of block cells.  Blocks
+        # are laid out group by group and the cells inside a group are kept
+        # sorted, so permutations of interchangeable blocks share one state,
+        # and a state is packed into the int sum(cell[j] * cells ** (k-1-j)).
+        # Visited/parent bookkeeping therefore never copies State or Board
+        # objects.  Returns the list of directions that finishes the game
+        # from the current positions, or None if that is impossible.
+        search.start_phase(stats, "setup")
+        trace = search.tracer(stats)
+        board = self.board
+        cells = board.rows * board.cols
+        count = len(self.cells)
+
+        slots = sorted(range(count), key=self.groups.__getitem__)
+        parking = [self.parking[i] for i in slots]
+        runs = []
+        low = 0
+        for j in range(1, count + 1):
+            if j == count or self.groups[slots[j]] != self.groups[slots[low]]:
+                if j - low > 1:
+                    runs.append((low, j))
+                low = j
+
+        def pack(layout):
+            if runs:
+                for first, last in runs:
+                    layout[first:last] = sorted(layout[first:last])
+            key = 0
+            for cell in layout:
+                key = key * cells + cell
+            return key
+
+        start = pack([self.cells[i] for i in slots])
+        target = pack([board.cell(self.goals[i]) for i in slots])
+
+        # Without collisions each block slides on its own until it parks, so
+        # a state is dead once some block can no longer reach any goal of its
+        # group.  Solid blocks can stop in front of each other on cells no
+        # lone slide reaches, so they get no pruning.
+        live = None
+        if not self.collide:
+            table = reach.reachability(board)
+            live = []
+            for goals in parking:
+                regions = [table.goal_region(goal) for goal in goals]
+                live.append(regions[0] if len(regions) == 1 else bytes(map(max, *regions)))
+            if not all(live[j][self.cells[i]] for j, i in enumerate(slots)):
+                search.record(stats, 0)
+                return None
+
+        # Without collisions a block's move is a table read, so the search
+        # loop does not call slide_cells.  steps[d][j][cell] is where slot j
+        # ends up from `cell` in direction d (the cell itself once parked)
+        # already scaled by its place in the key, cells ** (count-1-j), so
+        # the next key is the sum of one read per block.  A move that leaves
+        # a block unable to reach a goal reads -cells ** count, which makes
+        # the sum negative.  Keys are only re-sorted when a group has two
+        # blocks.
+        powers = [cells ** (count - 1 - j) for j in range(count)]
+        if live is not None:
+            stop = board.slides
+            dead = -cells ** count
+            typecode = "q" if cells ** count < 1 << 62 else None
+            steps = []
+            for d in range(4):
+                ends = stop[d::4]
+                tables = []
+                for goals, region, power in zip(parking, live, powers):
+                    table = [end * power if region[end] else dead for end in ends]
+                    for goal in goals:
+                        table[goal] = goal * power
+                    tables.append(array(typecode, table) if typecode else table)
+                steps.append(tables)
+        pair = live is not None and count == 2
+
+        # parent[key] = parent_key * 4 + direction index
+        parent = {start: -1}
+        queue = deque([start])
+        expanded = generated = peak = 0
+        search.start_phase(stats, "search")
+        while queue:
+            if len(queue) > peak:
+                peak = len(queue)
+            key = queue.popleft()
+            expanded += 1
+            if trace is not None:
+                trace("expand", key)
+            if key == target:
+                search.start_phase(stats, "path")
+                moves = []
+                link = parent[key]
+                while link >= 0:
+                    moves.append(DIRECTIONS[link & 3])
+                    link = parent[link >> 2]
+                moves.reverse()
+                search.record(stats, expanded, peak, generated)
+                return moves
+
+            if pair:
+                # The common two-block game, unrolled.
+                first_cell, second_cell = divmod(key, cells)
+                d = 0
+                for first, second in steps:
+                    next_key = first[first_cell] + second[second_cell]
+                    if next_key >= 0:
+                        if runs and next_key // cells > next_key % cells:
+                            next_key = next_key % cells * cells + next_key // cells
+                        if next_key not in parent:
+                            parent[next_key] = key * 4 + d
+                            queue.append(next_key)
+                            generated += 1
+                    d += 1
+                continue
+
+            layout = [key // power % cells for power in powers]
+            for d in range(4):
+                if live is None:
+                    next_key = pack(self.slide_cells(layout, d, parking))
+                else:
+                    next_key = sum(map(getitem, steps[d], layout))
+                    if next_key < 0:
+                        continue
+                    if runs:
+                        next_key = pack([next_key // power % cells for power in powers])
+                if next_key not in parent:
+                    parent[next_key] = key * 4 + d
+                    queue.append(next_key)
+                    generated += 1
+
+        search.record(stats, expanded, peak, generated)
+        return None
+
 class GameGUI:
     def __init__(self, root, state):
+        import tkinter as tk
         self.root = root
         self.state = state
         self.cell_size = 40
@@ -114,38 +296,91 @@ class GameGUI:
         self.reset_button = tk.Button(root, text="إعادة اللعب", command=self.reset_game)
         self.reset_button.pack()
 
+        self.undo_button = tk.Button(root, text="تراجع", command=self.undo_move)
+        self.undo_button.pack()
+
+        self.redo_button = tk.Button(root, text="إعادة الخطوة", command=self.redo_move)
+        self.redo_button.pack()
+
+        self.hint_label = tk.Label(root, text="")
+        self.hint_label.pack()
+
+        self.cells = render.BoardCanvas(self.canvas, self.state.board, self.cell_size)
+        self.pick_colors()
+        self.build_hints()
         self.draw_board()
         self.root.bind("<Key>", self.handle_keypress)
 
+    def pick_colors(self):
+        # Interchangeable blocks share their group's colours.
+        ranks = {}
+        for group in self.state.groups:
+            ranks.setdefault(group, len(ranks))
+        self.colors = [BLOCK_COLORS[ranks[group] % len(BLOCK_COLORS)] for group in self.state.groups]
+
+    def build_hints(self):
+        # Once per level; every hint after that is a table read.
+        try:
+            self.hints = hints.build(self.state)
+        except ValueError:
+            self.hints = None
+
+    def show_hint(self):
+        if self.hints is None:
+            return
+        hint = self.hints.lookup(self.state.cells)
+        if hint is None:
+            text = "لا يمكن إنهاء اللعبة من هنا، تراجع"
+        elif hint[1] is None:
+            text = ""
+        else:
+            text = f"أفضل حركة: {ARROWS[hint[1]]}  الحركات المتبقية: {hint[0]}"
+        self.hint_label.config(text=text)
+
     def draw_board(self):
-        self.canvas.delete("all")
-        for i in range(self.state.board.rows):
-            for j in range(self.state.board.cols):
-                x1, y1 = j * self.cell_size, i * self.cell_size
-                x2, y2 = x1 + self.cell_size, y1 + self.cell_size
-                if (i, j) == self.state.position1:
-                    color = "red" 
-                elif (i, j) == self.state.position2:
-                    color = "blue"  
-                elif (i, j) == self.state.start1:
-                    color = "#ff7f7f"  
-                elif (i, j) == self.state.start2:
-                    color = "#7fbfff"  
-                elif (i, j) == self.state.goal1:
-                    color = "#ff4c4c"  
-                elif (i, j) == self.state.goal2:
-                    color = "#4cafff"  
-                elif self.state.board.grid[i][j] == 0:
-                    color = "black"  
-                elif self.state.board.grid[i][j] == 2:
-                    color = "yellow"  
-                elif self.state.board.grid[i][j] == 3:
-                    color = "cyan"  
-                else:
-                    color = "white"
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="gray")
+        # Trails live in the canvas mark layer (paint_trail), so the overlay
+        # is only the blocks, starts and goals.
+        board = self.state.board
+        overlay = {}
+        # Lower-numbered blocks are drawn last so they stay on top.
+        for layer, positions in ((2, self.state.goals), (1, self.state.starts)):
+            for i in range(len(positions) - 1, -1, -1):
+                overlay[board.cell(positions[i])] = self.colors[i][layer]
+        for i in range(len(self.state.cells) - 1, -1, -1):
+            overlay[self.state.cells[i]] = self.colors[i][0]
+        self.cells.show(overlay)
+        self.show_hint()
+
+    def paint_trail(self, cells):
+        # Trail colour of each of `cells`: the last block whose trail covers
+        # it.  Only these cells are repainted.
+        trails = self.state.trails
+        for cell in cells:
+            for i in range(len(trails) - 1, -1, -1):
+                if trails[i][cell]:
+                    self.cells.mark((cell,), self.colors[i][3])
+                    break
+            else:
+                self.cells.unmark((cell,))
+
+    def undo_move(self):
+        cells = self.state.cells
+        self.state.undo()
+        self.paint_trail(cells)
+        self.draw_board()
+
+    def redo_move(self):
+        self.state.redo()
+        self.paint_trail(self.state.cells)
+        self.draw_board()
 
     def handle_keypress(self, event):
+        if event.keysym == "z":
+            self.undo_move()
+            return
+        if event.keysym == "y":
+            self.redo_move()
+            return
         if self.state.game_over:
             return  
 
@@ -161,31 +396,28 @@ class GameGUI:
 
         if direction:
             if not self.state.game_over:
-                
-                if self.state.position1 != self.state.goal1:
-                    self.state.move(direction, 1)  
-                if self.state.position2 != self.state.goal2:
-                    self.state.move(direction, 2)  
+                self.state.move(direction)
+                self.paint_trail(self.state.cells)
                 self.draw_board()
 
     def reset_game(self):
         board = Board(10, 10)
-        start1 = (1, 1)
-        goal1 = (8, 1)  
-        start2 = (1, 8)
-        goal2 = (8, 8)
-        self.state = State(board, start1, goal1, start2, goal2)
+        starts = [(1, 1), (1, 8)]
+        goals = [(8, 1), (8, 8)]
+        self.state = State(board, starts, goals)
         self.reset_button.config(state="disabled")
+        self.pick_colors()
+        self.build_hints()
+        self.cells.set_board(self.state.board)
         self.draw_board()
 
 if __name__ == "__main__":
-    board = Board(10, 10)
-    start1 = (1, 1)
+    import tkinter as tk
 
-    goal1 = (8, 1)  
-    start2 = (1, 8)
-    goal2 = (8, 8)
-    state = State(board, start1, goal1, start2, goal2)
+    board = Board(10, 10)
+    starts = [(1, 1), (1, 8)]
+    goals = [(8, 1), (8, 8)]
+    state = State(board, starts, goals)
     
     root = tk.Tk()
     root.title("Zero Squares Game")
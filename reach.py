@@ -0,0 +1,229 @@
+from array import array
+from collections import OrderedDict, deque
+
+# Per-board reachability, shared by every engine.  Each table is built on
+# first use, so a step search never pays for the slide ones.
+#
+#   stops         cells a slide can end on; after its first slide a block
+#                 only ever stands on one of these
+#   step_labels   connected components of the step graph, so a step query
+#                 is solvable exactly when start and goal share a label
+#   slide_labels  strongly connected components of the slide graph, numbered
+#                 by Tarjan's algorithm, which finishes every component
+#                 after all components it can reach.  A cell can reach the
+#                 goal only if its label >= label[goal]: an O(1) test that
+#                 rejects some unsolvable queries, but not all of them.
+#   regions       per-goal regions, every cell some sequence of slides
+#                 takes to the goal; one reverse BFS each, kept in a small
+#                 LRU.  These make the slide test exact, and a search that
+#                 only steps into its goal's region never expands a cell
+#                 that cannot finish (cells it reaches are forward-reachable
+#                 from the start by construction).
+#
+# Building a table costs about one full search, so the cheap engines only
+# use the tables of a model once something has built them for the board (see
+# cached(), ready() and reachability(board, model)); the expensive ones build
+# them.
+
+CACHE_SIZE = 32
+REGION_CACHE_SIZE = 16
+_tables = OrderedDict()
+
+
+class Reachability:
+    def __init__(self, board):
+        self.board = board
+        self.cells = board.rows * board.cols
+        self._stops = None
+        self._step_labels = None
+        self._slide_labels = None
+        self.regions = OrderedDict()
+
+    @property
+    def stops(self):
+        if self._stops is None:
+            self._stops = self.find_stops()
+        return self._stops
+
+    @property
+    def step_labels(self):
+        if self._step_labels is None:
+            self._step_labels = self.label_components()
+        return self._step_labels
+
+    @property
+    def slide_labels(self):
+        if self._slide_labels is None:
+            self._slide_labels = self.label_strong_components()
+        return self._slide_labels
+
+    def ready(self, model):
+        # Whether the tables for `model` are already built.
+        if model == "step":
+            return self._step_labels is not None
+        return self._slide_labels is not None
+
+    def build(self, model):
+        if model == "step":
+            self.step_labels
+        else:
+            self.stops
+            self.slide_labels
+
+    def find_stops(self):
+        slides = self.board.slides
+        stops = bytearray(self.cells)
+        for cell in range(self.cells):
+            for d in range(4):
+                stop = slides[cell * 4 + d]
+                if stop != cell:
+                    stops[stop] = 1
+        return stops
+
+    def label_components(self):
+        cols = self.board.cols
+        cells = self.cells
+        open_cells = self.board.open_cells
+        labels = array("i", [-1]) * cells
+        label = 0
+        for root in range(cells):
+            if not open_cells[root] or labels[root] >= 0:
+                continue
+            labels[root] = label
+            queue = deque([root])
+            while queue:
+                cell = queue.popleft()
+                col = cell % cols
+                for neighbor in (cell - cols if cell >= cols else -1,
+                                 cell + cols if cell + cols < cells else -1,
+                                 cell - 1 if col > 0 else -1,
+                                 cell + 1 if col < cols - 1 else -1):
+                    if neighbor >= 0 and open_cells[neighbor] and labels[neighbor] < 0:
+                        labels[neighbor] = label
+                        queue.append(neighbor)
+            label += 1
+        return labels
+
+    def label_strong_components(self):
+        # Iterative Tarjan over the slide graph.  work holds (cell, next
+        # direction to try) for the cells on the DFS path.
+        cells = self.cells
+        slides = self.board.slides
+        open_cells = self.board.open_cells
+        index = array("i", [-1]) * cells
+        low = array("i", [0]) * cells
+        on_stack = bytearray(cells)
+        labels = array("i", [-1]) * cells
+        stack = []
+        counter = label = 0
+        for root in range(cells):
+            if not open_cells[root] or index[root] >= 0:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [(root, 0)]
+            while work:
+                cell, d = work[-1]
+                if d < 4:
+                    work[-1] = (cell, d + 1)
+                    stop = slides[cell * 4 + d]
+                    if stop == cell:
+                        continue
+                    if index[stop] < 0:
+                        index[stop] = low[stop] = counter
+                        counter += 1
+                        stack.append(stop)
+                        on_stack[stop] = 1
+                        work.append((stop, 0))
+                    elif on_stack[stop] and index[stop] < low[cell]:
+                        low[cell] = index[stop]
+                    continue
+
+                work.pop()
+                if work and low[cell] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[cell]
+                if low[cell] == index[cell]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        labels[member] = label
+                        if member == cell:
+                            break
+                    label += 1
+        return labels
+
+    def solvable(self, start, goal, model="step"):
+        # Whether some path leads from start to goal.
+        if start == goal:
+            return True
+        if model == "step":
+            return self.step_labels[start] >= 0 and self.step_labels[start] == self.step_labels[goal]
+        labels = self.slide_labels
+        if not self.stops[goal] or labels[start] < labels[goal]:
+            return False
+        return bool(self.goal_region(goal)[start])
+
+    def prune(self, start, goal, moves, model):
+        # `moves` limited to cells that can still reach the goal, or None
+        # when the start cannot.  Step components are closed under moves, so
+        # only slides get a filter.
+        if not self.board.open_cells[start]:
+            return moves
+        if not self.solvable(start, goal, model):
+            return None
+        if model == "step" or start == goal:
+            return moves
+        region = self.goal_region(goal)
+
+        def live_moves(cell):
+            return [neighbor for neighbor in moves(cell) if region[neighbor]]
+
+        return live_moves
+
+    def goal_region(self, goal):
+        # One byte per cell, 1 where some sequence of slides ends on goal.
+        region = self.regions.get(goal)
+        if region is not None:
+            self.regions.move_to_end(goal)
+            return region
+        offsets, sources = self.board.reverse_slides
+        region = bytearray(self.cells)
+        region[goal] = 1
+        queue = deque([goal])
+        while queue:
+            cell = queue.popleft()
+            for source in sources[offsets[cell]:offsets[cell + 1]]:
+                if not region[source]:
+                    region[source] = 1
+                    queue.append(source)
+        self.regions[goal] = region
+        if len(self.regions) > REGION_CACHE_SIZE:
+            self.regions.popitem(last=False)
+        return region
+
+
+def reachability(board, *models):
+    # The board's table, with the tables of `models` built.
+    key = board.key()
+    table = _tables.get(key)
+    if table is None:
+        table = Reachability(board)
+        _tables[key] = table
+        if len(_tables) > CACHE_SIZE:
+            _tables.popitem(last=False)
+    else:
+        _tables.move_to_end(key)
+        table.board = board
+    for model in models:
+        table.build(model)
+    return table
+
+
+def cached(board):
+    # The board's table if reachability(board) has been called, else None.
+    table = _tables.get(board.key())
+    if table is not None:
+        table.board = board
+    return table
@@ -0,0 +1,75 @@
+# Incremental board drawing for the Tk front-ends.  One rectangle item is
+# created per cell and kept; each frame the GUI passes an overlay
+# {cell id: colour} for the cells that differ from the plain board (start,
+# goal, blocks, path), and only the cells whose colour actually changed
+# since the last frame get an itemconfig.  A redraw therefore costs O(size
+# of the old and new overlays), not O(rows * cols).  Marks are a persistent
+# layer between the board and the overlay, painted as they change, for
+# cells streamed in by a running search and for block trails.
+
+EXPLORED = "#d6e6ff"
+
+
+class BoardCanvas:
+    def __init__(self, canvas, board, cell_size=40):
+        self.canvas = canvas
+        self.cell_size = cell_size
+        self.rows = self.cols = 0
+        self.items = []
+        self.shown = []
+        self.overlay = {}
+        self.marks = {}
+        self.set_board(board)
+
+    def set_board(self, board):
+        # Called on start and on reset; walls may have changed, so every
+        # cell is checked once here.
+        if (board.rows, board.cols) != (self.rows, self.cols):
+            self.create_items(board.rows, board.cols)
+        self.base = ["black" if value == 0 else "white" for grid_row in board.grid for value in grid_row]
+        self.overlay = {}
+        self.marks = {}
+        for cell, color in enumerate(self.base):
+            self.paint(cell, color)
+
+    def create_items(self, rows, cols):
+        self.canvas.delete("all")
+        self.rows, self.cols = rows, cols
+        size = self.cell_size
+        self.items = []
+        for i in range(rows):
+            for j in range(cols):
+                x1, y1 = j * size, i * size
+                self.items.append(self.canvas.create_rectangle(
+                    x1, y1, x1 + size, y1 + size, fill="white", outline="gray"))
+        self.shown = ["white"] * (rows * cols)
+
+    def paint(self, cell, color):
+        if self.shown[cell] != color:
+            self.shown[cell] = color
+            self.canvas.itemconfig(self.items[cell], fill=color)
+
+    def show(self, overlay):
+        for cell in self.overlay:
+            if cell not in overlay:
+                self.paint(cell, self.marks.get(cell, self.base[cell]))
+        for cell, color in overlay.items():
+            self.paint(cell, color)
+        self.overlay = overlay
+
+    def mark(self, cells, color):
+        for cell in cells:
+            self.marks[cell] = color
+            if cell not in self.overlay:
+                self.paint(cell, color)
+
+    def unmark(self, cells):
+        for cell in cells:
+            if self.marks.pop(cell, None) is not None and cell not in self.overlay:
+                self.paint(cell, self.base[cell])
+
+    def clear_marks(self):
+        marks, self.marks = self.marks, {}
+        for cell in marks:
+            if cell not in self.overlay:
+                self.paint(cell, self.base[cell])
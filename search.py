@@ -0,0 +1,678 @@
+import heapq
+import time
+from array import array
+from collections import deque
+
+import reach
+
+# Shared search core.  Positions are turned into cell ids (row * cols + col)
+# and every engine records one predecessor id per cell in a flat array, so
+# the path is rebuilt once at the goal instead of being copied on every
+# expansion.
+
+
+def step_moves(board):
+    # One cell at a time in the four directions, as in bfs_path/dfs/astar.
+    cols = board.cols
+    cells = board.rows * cols
+    open_cells = board.open_cells
+
+    def moves(cell):
+        result = []
+        col = cell % cols
+        if cell >= cols and open_cells[cell - cols]:
+            result.append(cell - cols)
+        if cell + cols < cells and open_cells[cell + cols]:
+            result.append(cell + cols)
+        if col > 0 and open_cells[cell - 1]:
+            result.append(cell - 1)
+        if col < cols - 1 and open_cells[cell + 1]:
+            result.append(cell + 1)
+        return result
+
+    moves.model = "step"
+    return moves
+
+
+def slide_moves(board):
+    # Slide until blocked, as on a keypress; staying put is not a move.
+    slides = board.slides
+
+    def moves(cell):
+        result = []
+        for d in range(4):
+            stop = slides[cell * 4 + d]
+            if stop != cell:
+                result.append(stop)
+        return result
+
+    moves.model = "slide"
+    return moves
+
+
+def reverse_slide_moves(board):
+    # Cells that slide onto `cell` in one move.
+    offsets, sources = board.reverse_slides
+
+    def moves(cell):
+        return sources[offsets[cell]:offsets[cell + 1]]
+
+    # Same pruning band as forward slides: see reach.py.
+    moves.model = "slide"
+    return moves
+
+
+MOVE_MODELS = {"step": step_moves, "slide": slide_moves}
+
+
+def reverse_moves_for(board, moves):
+    # Steps are their own reverse, slides are not; anything else has to
+    # come with its reverse graph.
+    model = getattr(moves, "model", None)
+    if model == "step":
+        return moves
+    if model == "slide":
+        return reverse_slide_moves(board)
+    raise ValueError("reverse_moves is needed for an untagged move function")
+
+
+class SearchStats:
+    # Filled in by an engine when passed as stats=...  Times are per phase
+    # ("setup", "search", "path") in seconds.  `trace`, when set, is called
+    # as trace(event, cell) for every expanded cell; engines copy it into a
+    # local first, so leaving it unset costs one `is not None` test per node.
+    def __init__(self, trace=None):
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.max_frontier = 0
+        self.heuristic_calls = 0
+        self.timings = {}
+        self.trace = trace
+        self._phase = None
+        self._started = 0.0
+
+    def phase(self, name):
+        # Closes the running phase and starts `name` (None just closes).
+        now = time.perf_counter()
+        if self._phase is not None:
+            self.timings[self._phase] = self.timings.get(self._phase, 0.0) + now - self._started
+        self._phase, self._started = name, now
+
+    def as_dict(self):
+        return {"expanded": self.expanded, "generated": self.generated,
+                "duplicates": self.duplicates, "max_frontier": self.max_frontier,
+                "heuristic_calls": self.heuristic_calls, "timings": dict(self.timings)}
+
+
+def start_phase(stats, name):
+    if stats is not None:
+        stats.phase(name)
+
+
+def tracer(stats):
+    return stats.trace if stats is not None else None
+
+
+def record(stats, expanded, max_frontier=0, generated=0, duplicates=0, heuristic_calls=0):
+    if stats is not None:
+        stats.expanded = expanded
+        stats.max_frontier = max_frontier
+        stats.generated = generated
+        stats.duplicates = duplicates
+        stats.heuristic_calls = heuristic_calls
+        stats.phase(None)
+
+
+def on_board(board, *positions):
+    # Cell ids are row * cols + col, so an off-board position would wrap
+    # onto some other cell; engines check their endpoints first.
+    return all(0 <= row < board.rows and 0 <= col < board.cols for row, col in positions)
+
+
+def live_moves(board, start_cell, goal_cell, moves, build=False):
+    # `moves` pruned by the per-board reachability tables in reach.py, or
+    # None when the goal cannot be reached.  Without `build` the tables are
+    # used only if already built for the move model.  Untagged move
+    # functions pass through.
+    model = getattr(moves, "model", None)
+    table = reach.reachability(board) if build else reach.cached(board)
+    if model is None or table is None or not (build or table.ready(model)):
+        return moves
+    return table.prune(start_cell, goal_cell, moves, model)
+
+
+def new_parents(board):
+    return array("i", [-1]) * (board.rows * board.cols)
+
+
+def trace_path(board, parent, goal):
+    path = []
+    cell = goal
+    while True:
+        path.append(board.position(cell))
+        if parent[cell] == cell:
+            break
+        cell = parent[cell]
+    path.reverse()
+    return path
+
+
+def distances(board, source, moves=None):
+    # Move counts from `source` to every cell (-1 where unreachable).  With
+    # reverse moves this gives the distance from every cell to `source`.
+    moves = moves or step_moves(board)
+    distance = array("i", [-1]) * (board.rows * board.cols)
+    distance[source] = 0
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        next_distance = distance[current] + 1
+        for neighbor in moves(current):
+            if distance[neighbor] < 0:
+                distance[neighbor] = next_distance
+                queue.append(neighbor)
+    return distance
+
+
+def bfs(board, start, goal, moves=None, stats=None):
+    start_phase(stats, "setup")
+    trace = tracer(stats)
+    if not on_board(board, start, goal):
+        record(stats, 0)
+        return []
+    moves = moves or step_moves(board)
+    start_cell, goal_cell = board.cell(start), board.cell(goal)
+    moves = live_moves(board, start_cell, goal_cell, moves)
+    if moves is None:
+        record(stats, 0)
+        return []
+    parent = new_parents(board)
+    parent[start_cell] = start_cell
+    queue = deque([start_cell])
+    expanded = generated = peak = 0
+    start_phase(stats, "search")
+
+    while queue:
+        if len(queue) > peak:
+            peak = len(queue)
+        current = queue.popleft()
+        expanded += 1
+        if trace is not None:
+            trace("expand", current)
+        if current == goal_cell:
+            start_phase(stats, "path")
+            path = trace_path(board, parent, goal_cell)
+            record(stats, expanded, peak, generated)
+            return path
+
+        for neighbor in moves(current):
+            if parent[neighbor] < 0:
+                parent[neighbor] = current
+                queue.append(neighbor)
+                generated += 1
+
+    record(stats, expanded, peak, generated)
+    return []
+
+
+def dfs(board, start, goal, moves=None, stats=None):
+    # Stack entries pack (cell, predecessor) into one int so the parent
+    # recorded for a cell is the one it was actually expanded from.
+    start_phase(stats, "setup")
+    trace = tracer(stats)
+    if not on_board(board, start, goal):
+        record(stats, 0)
+        return []
+    moves = moves or step_moves(board)
+    cells = board.rows * board.cols
+    start_cell, goal_cell = board.cell(start), board.cell(goal)
+    moves = live_moves(board, start_cell, goal_cell, moves)
+    if moves is None:
+        record(stats, 0)
+        return []
+    parent = new_parents(board)
+    stack = [start_cell * cells + start_cell]
+    expanded = generated = duplicates = peak = 0
+    start_phase(stats, "search")
+
+    while stack:
+        if len(stack) > peak:
+            peak = len(stack)
+        current, previous = divmod(stack.pop(), cells)
+        if parent[current] >= 0:
+            duplicates += 1
+            continue
+        parent[current] = previous
+        expanded += 1
+        if trace is not None:
+            trace("expand", current)
+        if current == goal_cell:
+            start_phase(stats, "path")
+            path = trace_path(board, parent, goal_cell)
+            record(stats, expanded, peak, generated, duplicates)
+            return path
+
+        for neighbor in moves(current):
+            if parent[neighbor] < 0:
+                stack.append(neighbor * cells + current)
+                generated += 1
+
+    record(stats, expanded, peak, generated, duplicates)
+    return []
+
+
+def manhattan(board, goal):
+    # Admissible for step moves only; a single slide may cover many cells.
+    cols = board.cols
+    goal_row, goal_col = goal
+
+    def heuristic(cell):
+        row, col = divmod(cell, cols)
+        return abs(row - goal_row) + abs(col - goal_col)
+
+    return heuristic
+
+
+def astar(board, start, goal, heuristic=None, moves=None, stats=None):
+    start_phase(stats, "setup")
+    trace = tracer(stats)
+    if not on_board(board, start, goal):
+        record(stats, 0)
+        return []
+    moves = moves or step_moves(board)
+    heuristic = heuristic or manhattan(board, goal)
+    start_cell, goal_cell = board.cell(start), board.cell(goal)
+    moves = live_moves(board, start_cell, goal_cell, moves)
+    if moves is None:
+        record(stats, 0)
+        return []
+    parent = new_parents(board)
+    cost = {start_cell: 0}
+    closed = bytearray(board.rows * board.cols)
+    parent[start_cell] = start_cell
+    # Entries are (f, -g, cell): among equal f the deepest node comes first,
+    # which avoids expanding whole plateaus of ties on open boards.
+    open_list = [(heuristic(start_cell), 0, start_cell)]
+    expanded = generated = duplicates = peak = 0
+    heuristic_calls = 1
+    start_phase(stats, "search")
+
+    while open_list:
+        if len(open_list) > peak:
+            peak = len(open_list)
+        _, current_cost, current = heapq.heappop(open_list)
+        current_cost = -current_cost
+        if closed[current]:
+            duplicates += 1
+            continue
+        closed[current] = 1
+        expanded += 1
+        if trace is not None:
+            trace("expand", current)
+        if current == goal_cell:
+            start_phase(stats, "path")
+            path = trace_path(board, parent, goal_cell)
+            record(stats, expanded, peak, generated, duplicates, heuristic_calls)
+            return path
+
+        next_cost = current_cost + 1
+        for neighbor in moves(current):
+            if not closed[neighbor] and next_cost < cost.get(neighbor, next_cost + 1):
+                cost[neighbor] = next_cost
+                parent[neighbor] = current
+                heapq.heappush(open_list, (next_cost + heuristic(neighbor), -next_cost, neighbor))
+                generated += 1
+                heuristic_calls += 1
+
+    record(stats, expanded, peak, generated, duplicates, heuristic_calls)
+    return []
+
+
+DEAD = 1 << 30
+# Transposition table slots used by the CLIs: four int arrays, 1 MiB.
+TABLE_SIZE = 1 << 16
+
+
+def ida_star(board, start, goal, heuristic=None, moves=None, table_size=0, max_depth=None,
+             stats=None):
+    # Iterative-deepening A*: depth-first passes bounded by f = g + h, each
+    # pass raising the bound to the smallest f that went over it.  Only the
+    # current path and one neighbour iterator per level are kept, so memory
+    # grows with the solution depth, not the board.
+    #
+    # table_size > 0 adds a fixed-size transposition table, slot cell %
+    # table_size, newest entry wins.  A slot remembers the pass and depth at
+    # which its cell was last expanded, so a cell reached again no shallower
+    # in the same pass is skipped, and a backed-up h: when a cell's subtree
+    # is exhausted its h becomes the smallest f seen below it minus its
+    # depth, which is still a lower bound and lets later passes cut it early.
+    start_phase(stats, "setup")
+    trace = tracer(stats)
+    if not on_board(board, start, goal):
+        record(stats, 0)
+        return []
+    moves = moves or step_moves(board)
+    heuristic = heuristic or manhattan(board, goal)
+    start_cell, goal_cell = board.cell(start), board.cell(goal)
+    # The reachability tables are per-cell arrays, so they are only used if
+    # already built (reach.reachability(board, model)).  Without them an
+    # unsolvable query runs passes until `limit`; pass max_depth to bound it.
+    moves = live_moves(board, start_cell, goal_cell, moves)
+    if moves is None:
+        record(stats, 0)
+        return []
+    # A shortest path never repeats a cell, so it has fewer moves than cells.
+    limit = board.rows * board.cols - 1 if max_depth is None else max_depth
+    if table_size:
+        # More slots than cells would never be used.
+        table_size = min(table_size, board.rows * board.cols)
+        table_cell = array("i", [-1]) * table_size
+        table_pass = array("i", [-1]) * table_size
+        table_depth = array("i", [0]) * table_size
+        table_h = array("i", [0]) * table_size
+    expanded = generated = duplicates = peak = 0
+    heuristic_calls = 1
+    bound = heuristic(start_cell)
+    iteration = 0
+    start_phase(stats, "search")
+
+    while bound <= limit:
+        expanded += 1
+        if trace is not None:
+            trace("expand", start_cell)
+        if start_cell == goal_cell:
+            record(stats, expanded, 1, generated, duplicates, heuristic_calls)
+            return [start]
+
+        path = [start_cell]
+        on_path = {start_cell}
+        frames = [iter(moves(start_cell))]
+        # minimums[i]: smallest f cut off so far below path[i].
+        minimums = [DEAD]
+        while frames:
+            depth = len(path)
+            neighbor = next(frames[-1], -1)
+            if neighbor < 0:
+                frames.pop()
+                cell = path.pop()
+                on_path.discard(cell)
+                best = minimums.pop()
+                if minimums and best < minimums[-1]:
+                    minimums[-1] = best
+                if table_size:
+                    slot = cell % table_size
+                    if table_cell[slot] != cell:
+                        table_cell[slot] = cell
+                        table_pass[slot] = -1
+                        table_h[slot] = 0
+                    if best - depth + 1 > table_h[slot]:
+                        table_h[slot] = min(best - depth + 1, DEAD)
+                continue
+
+            generated += 1
+            heuristic_calls += 1
+            h = heuristic(neighbor)
+            seen = neighbor in on_path
+            if table_size:
+                slot = neighbor % table_size
+                if table_cell[slot] == neighbor:
+                    if table_h[slot] > h:
+                        h = table_h[slot]
+                    if table_pass[slot] == iteration and table_depth[slot] <= depth:
+                        seen = True
+            f = depth + h
+            if seen or f > bound:
+                if seen:
+                    duplicates += 1
+                if f < minimums[-1]:
+                    minimums[-1] = f
+                continue
+
+            path.append(neighbor)
+            expanded += 1
+            if trace is not None:
+                trace("expand", neighbor)
+            if neighbor == goal_cell:
+                start_phase(stats, "path")
+                result = [board.position(cell) for cell in path]
+                record(stats, expanded, max(peak, len(path)), generated, duplicates,
+                       heuristic_calls)
+                return result
+            if len(path) > peak:
+                peak = len(path)
+            on_path.add(neighbor)
+            frames.append(iter(moves(neighbor)))
+            minimums.append(DEAD)
+            if table_size:
+                if table_cell[slot] != neighbor:
+                    table_cell[slot] = neighbor
+                    table_h[slot] = 0
+                table_pass[slot] = iteration
+                table_depth[slot] = depth
+
+        # The pass failed, so the answer is deeper than `bound`; f values
+        # are whole moves, so the next bound is at least one more.
+        if best >= DEAD:
+            break
+        bound = max(best, bound + 1)
+        iteration += 1
+
+    record(stats, expanded, peak, generated, duplicates, heuristic_calls)
+    return []
+
+
+def iddfs(board, start, goal, moves=None, table_size=0, max_depth=None, stats=None):
+    # Iterative-deepening DFS: IDA* with h = 0, one move deeper per pass
+    # (more once the transposition table has backed-up values).
+    return ida_star(board, start, goal, lambda cell: 0, moves, table_size, max_depth, stats)
+
+
+def bidirectional_bfs(board, start, goal, moves=None, reverse_moves=None, stats=None):
+    # Grows one BFS layer at a time from whichever side has the smaller
+    # frontier.  The forward side follows `moves`, the backward side follows
+    # `reverse_moves` (slides leading into a cell).  Once the frontiers
+    # touch, the rest of that layer is still scanned so the shortest meeting
+    # point wins and the move count matches plain BFS.
+    if moves is None:
+        moves = slide_moves(board)
+    if reverse_moves is None:
+        reverse_moves = reverse_moves_for(board, moves)
+    start_phase(stats, "setup")
+    trace = tracer(stats)
+    if not on_board(board, start, goal):
+        record(stats, 0)
+        return []
+    start_cell, goal_cell = board.cell(start), board.cell(goal)
+    if start_cell == goal_cell:
+        record(stats, 0, 1)
+        return [start]
+    if not board.open_cells[goal_cell]:
+        # The backward side would otherwise walk out of a wall.
+        record(stats, 0)
+        return []
+    moves = live_moves(board, start_cell, goal_cell, moves)
+    reverse_moves = live_moves(board, start_cell, goal_cell, reverse_moves)
+    if moves is None or reverse_moves is None:
+        record(stats, 0)
+        return []
+
+    parent = new_parents(board)
+    child = new_parents(board)
+    parent[start_cell] = start_cell
+    child[goal_cell] = goal_cell
+    depth = {start_cell: 0}
+    back_depth = {goal_cell: 0}
+    forward = [start_cell]
+    backward = [goal_cell]
+    expanded = generated = peak = 0
+    start_phase(stats, "search")
+
+    while forward and backward:
+        if len(forward) <= len(backward):
+            frontier, expand, seen, other, links, other_depth, own_depth = (
+                forward, moves, parent, child, parent, back_depth, depth)
+        else:
+            frontier, expand, seen, other, links, other_depth, own_depth = (
+                backward, reverse_moves, child, parent, child, depth, back_depth)
+
+        best, meet = None, None
+        next_frontier = []
+        expanded += len(frontier)
+        if len(forward) + len(backward) > peak:
+            peak = len(forward) + len(backward)
+        for current in frontier:
+            if trace is not None:
+                trace("expand", current)
+            for neighbor in expand(current):
+                if seen[neighbor] >= 0:
+                    continue
+                links[neighbor] = current
+                own_depth[neighbor] = own_depth[current] + 1
+                next_frontier.append(neighbor)
+                generated += 1
+                if other[neighbor] >= 0:
+                    total = own_depth[neighbor] + other_depth[neighbor]
+                    if best is None or total < best:
+                        best, meet = total, neighbor
+
+        if meet is not None:
+            start_phase(stats, "path")
+            path = trace_path(board, parent, meet)
+            cell = meet
+            while child[cell] != cell:
+                cell = child[cell]
+                path.append(board.position(cell))
+            record(stats, expanded, peak, generated)
+            return path
+
+        if frontier is forward:
+            forward = next_frontier
+        else:
+            backward = next_frontier
+
+    record(stats, expanded, peak, generated)
+    return []
+
+
+def jps(board, start, goal, stats=None):
+    # Jump Point Search for 4-connected, unit-cost step moves.  Instead of
+    # pushing every neighbour, a direction is followed until it reaches the
+    # goal or a cell with a forced neighbour (an opening that only appears
+    # past a wall), and only those jump points go on the heap.  Vertical
+    # jumps also stop where a horizontal jump would find something, which
+    # keeps the pruned search optimal.
+    start_phase(stats, "setup")
+    trace = tracer(stats)
+    if not on_board(board, start, goal):
+        record(stats, 0)
+        return []
+    rows, cols = board.rows, board.cols
+    open_cells = board.open_cells
+    start_cell, goal_cell = board.cell(start), board.cell(goal)
+    if live_moves(board, start_cell, goal_cell, step_moves(board)) is None:
+        record(stats, 0)
+        return []
+    goal_row, goal_col = goal
+
+    def walkable(row, col):
+        return 0 <= row < rows and 0 <= col < cols and open_cells[row * cols + col]
+
+    def jump_horizontal(row, col, dc):
+        while True:
+            col += dc
+            if not walkable(row, col):
+                return -1
+            cell = row * cols + col
+            if cell == goal_cell:
+                return cell
+            if ((walkable(row - 1, col) and not walkable(row - 1, col - dc)) or
+                    (walkable(row + 1, col) and not walkable(row + 1, col - dc))):
+                return cell
+
+    def jump_vertical(row, col, dr):
+        while True:
+            row += dr
+            if not walkable(row, col):
+                return -1
+            cell = row * cols + col
+            if cell == goal_cell:
+                return cell
+            if ((walkable(row, col - 1) and not walkable(row - dr, col - 1)) or
+                    (walkable(row, col + 1) and not walkable(row - dr, col + 1))):
+                return cell
+            if jump_horizontal(row, col, 1) >= 0 or jump_horizontal(row, col, -1) >= 0:
+                return cell
+
+    parent = new_parents(board)
+    parent[start_cell] = start_cell
+    cost = {start_cell: 0}
+    closed = bytearray(rows * cols)
+    open_list = [(abs(start[0] - goal_row) + abs(start[1] - goal_col), 0, start_cell)]
+    expanded = generated = duplicates = peak = 0
+    heuristic_calls = 1
+    start_phase(stats, "search")
+
+    while open_list:
+        if len(open_list) > peak:
+            peak = len(open_list)
+        _, current_cost, current = heapq.heappop(open_list)
+        current_cost = -current_cost
+        if closed[current]:
+            duplicates += 1
+            continue
+        closed[current] = 1
+        expanded += 1
+        if trace is not None:
+            trace("expand", current)
+        if current == goal_cell:
+            start_phase(stats, "path")
+            path = expand_jumps(board, parent, goal_cell)
+            record(stats, expanded, peak, generated, duplicates, heuristic_calls)
+            return path
+
+        row, col = divmod(current, cols)
+        parent_row, parent_col = divmod(parent[current], cols)
+        dr = (row > parent_row) - (row < parent_row)
+        dc = (col > parent_col) - (col < parent_col)
+        if dc:
+            directions = [(-1, 0), (1, 0), (0, dc)]
+        elif dr:
+            directions = [(0, -1), (0, 1), (dr, 0)]
+        else:
+            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+        for step_row, step_col in directions:
+            if step_col:
+                jump = jump_horizontal(row, col, step_col)
+            else:
+                jump = jump_vertical(row, col, step_row)
+            if jump < 0 or closed[jump]:
+                continue
+            jump_row, jump_col = divmod(jump, cols)
+            next_cost = current_cost + abs(jump_row - row) + abs(jump_col - col)
+            if next_cost < cost.get(jump, next_cost + 1):
+                cost[jump] = next_cost
+                parent[jump] = current
+                estimate = abs(jump_row - goal_row) + abs(jump_col - goal_col)
+                heapq.heappush(open_list, (next_cost + estimate, -next_cost, jump))
+                generated += 1
+                heuristic_calls += 1
+
+    record(stats, expanded, peak, generated, duplicates, heuristic_calls)
+    return []
+
+
+def expand_jumps(board, parent, goal):
+    # Jump points are joined by straight runs; fill in the cells between.
+    jumps = trace_path(board, parent, goal)
+    path = [jumps[0]]
+    for row, col in jumps[1:]:
+        last_row, last_col = path[-1]
+        step_row = (row > last_row) - (row < last_row)
+        step_col = (col > last_col) - (col < last_col)
+        while (last_row, last_col) != (row, col):
+            last_row += step_row
+            last_col += step_col
+            path.append((last_row, last_col))
+    return path
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict, deque
+
+import batch
+import levels
+import search
+
+# Local solver service.  Clients connect over a Unix socket (or localhost TCP
+# with --port) and send one JSON request per line: a level in the levels.py
+# format plus optional "id", "engine", "model" and "backend",
+#
+#     {"id": 7, "grid": ["#####", ...], "start": [1, 1], "goal": [3, 3],
+#      "engine": "astar", "model": "slide"}
+#
+# and get one line back per request, {"id": 7, "result": {...}, "cached":
+# false} or {"id": 7, "error": "..."}, in completion order.  {"op": "stats"}
+# answers with the queue depth, cache counters and latency percentiles.
+#
+# Searches run on a process pool and the event loop only moves JSON.  A
+# request identical to one already being solved awaits the same future
+# instead of queueing a second search, and finished results are kept in an
+# LRU, so repeated queries never reach the pool.
+
+SOCKET = "solver.sock"
+LINE_LIMIT = 64 << 20
+CACHE_SIZE = 1024
+LATENCY_SAMPLES = 4096
+PERCENTILES = (50, 90, 99)
+
+
+class SolverService:
+    def __init__(self, workers=None, cache_size=CACHE_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_size = cache_size
+        self.pool = None
+        self.cache = OrderedDict()
+        self.in_flight = {}
+        self.running = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.requests = self.hits = self.coalesced = self.errors = 0
+
+    def start(self):
+        from concurrent.futures import ProcessPoolExecutor
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    async def solve(self, request):
+        # (result dict, whether it came from the cache).
+        engine = request.get("engine", "bfs")
+        model = request.get("model", "step")
+        backend = request.get("backend", "list")
+        if engine not in batch.ENGINES:
+            raise ValueError(f"unknown engine {engine!r}")
+        if model not in search.MOVE_MODELS:
+            raise ValueError(f"unknown move model {model!r}")
+        level = {"grid": request["grid"]}
+        for block, (start, goal) in enumerate(levels.level_blocks(request)):
+            start_key, goal_key = levels.block_keys(block)
+            level[start_key], level[goal_key] = tuple(start), tuple(goal)
+        key = json.dumps([level["grid"], levels.level_blocks(level), engine, model, backend])
+
+        result = self.cache.get(key)
+        if result is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return result, True
+        future = self.in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self.run(key, level, engine, model, backend))
+            self.in_flight[key] = future
+        else:
+            self.coalesced += 1
+        # Shielded so a client hanging up does not cancel a search that
+        # other clients are waiting on.
+        return await asyncio.shield(future), False
+
+    async def run(self, key, level, engine, model, backend):
+        loop = asyncio.get_running_loop()
+        self.running += 1
+        try:
+            result = await loop.run_in_executor(self.pool, batch.solve_level, level, engine,
+                                                model, backend)
+        finally:
+            self.running -= 1
+            del self.in_flight[key]
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def stats(self):
+        samples = sorted(self.latencies)
+        latency = {}
+        for percentile in PERCENTILES:
+            if samples:
+                rank = min(len(samples) - 1, len(samples) * percentile // 100)
+                latency[f"p{percentile}"] = round(samples[rank] * 1000, 3)
+        return {"requests": self.requests, "errors": self.errors, "cache_hits": self.hits,
+                "coalesced": self.coalesced, "cached": len(self.cache),
+                "running": self.running, "queue_depth": max(0, self.running - self.workers),
+                "latency_ms": latency}
+
+    async def answer(self, line):
+        began = time.perf_counter()
+        self.requests += 1
+        request = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("a request is a JSON object")
+            reply = {"id": request.get("id")}
+            if request.get("op") == "stats":
+                reply["stats"] = self.stats()
+                return reply
+            reply["result"], reply["cached"] = await self.solve(request)
+        except Exception as error:
+            # Bad requests and failed searches alike go back to the client.
+            self.errors += 1
+            reply = {"id": request.get("id") if isinstance(request, dict) else None,
+                     "error": f"{type(error).__name__}: {error}"}
+        self.latencies.append(time.perf_counter() - began)
+        return reply
+
+    async def handle(self, reader, writer):
+        # Requests on one connection are answered concurrently, so a slow
+        # search does not hold up the cheap ones pipelined behind it.
+        async def respond(line):
+            reply = await self.answer(line)
+            writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+            await writer.drain()
+
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(respond(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            writer.close()
+
+
+async def serve(service, path=SOCKET, host="127.0.0.1", port=None):
+    if port is None:
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(service.handle, path, limit=LINE_LIMIT)
+    else:
+        server = await asyncio.start_server(service.handle, host, port, limit=LINE_LIMIT)
+    async with server:
+        await server.serve_forever()
+
+
+def ask(requests, path=SOCKET, host="127.0.0.1", port=None):
+    # Blocking client: sends the requests on one connection and returns the
+    # replies in request order (requests without an "id" get their index).
+    import socket
+    if port is None:
+        connection = socket.socket(socket.AF_UNIX)
+        connection.connect(path)
+    else:
+        connection = socket.create_connection((host, port))
+    requests = [dict(request, id=request.get("id", index)) for index, request in enumerate(requests)]
+    with connection, connection.makefile("rwb") as stream:
+        for request in requests:
+            stream.write(json.dumps(request, separators=(",", ":")).encode() + b"\n")
+        stream.flush()
+        replies = {}
+        for _ in requests:
+            reply = json.loads(stream.readline())
+            replies[reply["id"]] = reply
+    return [replies[request["id"]] for request in requests]
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve Zero Squares solvers over a local socket.")
+    parser.add_argument("--socket", default=SOCKET, help="Unix socket path")
+    parser.add_argument("--port", type=int, default=None,
+                        help="listen on localhost TCP instead of the Unix socket")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="solver processes (default: CPU count)")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE, help="results kept in the LRU")
+    args = parser.parse_args(argv)
+
+    service = SolverService(args.workers, args.cache_size)
+    service.start()
+    try:
+        asyncio.run(serve(service, args.socket, port=args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import json
+import sqlite3
+
+# Persistent solution store.  A query is looked up by its canonical form: of
+# the eight symmetries of the grid (the transpose or not, then a flip of the
+# rows and/or the columns), the one whose (rows, cols, layout, start, goal)
+# sorts first.  Levels that are rotations or mirror images of each other
+# therefore share one row, and a hit is mapped back through the inverse
+# transform.  Both move models look the same under all eight symmetries, so
+# the mapped path is as valid and as short as the stored one.
+#
+# Keys also carry the move model and a solver kind, since a DFS path or a
+# uniform-cost path is a different answer from a shortest-move one.
+
+SHORTEST = ("bfs", "astar", "jps", "alt", "bidirectional", "ida", "iddfs")
+
+
+def engine_kind(engine):
+    return "shortest" if engine in SHORTEST else engine
+
+
+def transformer(rows, cols, symmetry):
+    # (rows, cols) after the symmetry, and the map of a point onto it.
+    transpose, flip_rows, flip_cols = symmetry & 4, symmetry & 1, symmetry & 2
+    new_rows, new_cols = (cols, rows) if transpose else (rows, cols)
+
+    def forward(row, col):
+        if transpose:
+            row, col = col, row
+        return (new_rows - 1 - row if flip_rows else row,
+                new_cols - 1 - col if flip_cols else col)
+
+    return new_rows, new_cols, forward
+
+
+def inverse(rows, cols, symmetry):
+    # Maps a point of the transformed (rows, cols) grid back.
+    def backward(row, col):
+        if symmetry & 1:
+            row = rows - 1 - row
+        if symmetry & 2:
+            col = cols - 1 - col
+        return (col, row) if symmetry & 4 else (row, col)
+
+    return backward
+
+
+def transform_layout(layout, symmetry):
+    if symmetry & 4:
+        layout = ["".join(column) for column in zip(*layout)]
+    if symmetry & 1:
+        layout = layout[::-1]
+    if symmetry & 2:
+        layout = [line[::-1] for line in layout]
+    return layout
+
+
+def canonical(layout, start, goal):
+    # (symmetry, transformed layout, start, goal) that sorts first.
+    rows, cols = len(layout), len(layout[0]) if layout else 0
+    best = None
+    for symmetry in range(8):
+        new_rows, new_cols, forward = transformer(rows, cols, symmetry)
+        candidate = (new_rows, new_cols, transform_layout(layout, symmetry),
+                     forward(*start), forward(*goal), symmetry)
+        if best is None or candidate < best:
+            best = candidate
+    new_rows, new_cols, layout, start, goal, symmetry = best
+    return symmetry, layout, start, goal
+
+
+def level_key(layout, start, goal, model="step", kind="shortest"):
+    import hashlib
+    symmetry, layout, start, goal = canonical(layout, start, goal)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([model, kind, layout, start, goal], separators=(",", ":")).encode())
+    return digest.hexdigest(), symmetry
+
+
+class SolutionStore:
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS solutions "
+                                "(key TEXT PRIMARY KEY, path TEXT)")
+        self.connection.commit()
+        self.hits = self.misses = 0
+
+    def path(self, board, start, goal, solve, model="step", kind="shortest"):
+        # solve() runs the search on a miss; its path of (row, col) points
+        # (or None) is stored in canonical coordinates.
+        key, symmetry = level_key(board.to_layout(), start, goal, model, kind)
+        row = self.connection.execute("SELECT path FROM solutions WHERE key = ?", (key,)).fetchone()
+        rows, cols, forward = transformer(board.rows, board.cols, symmetry)
+        if row is not None:
+            self.hits += 1
+            stored = json.loads(row[0])
+            if stored is None:
+                return None
+            backward = inverse(rows, cols, symmetry)
+            return [backward(*point) for point in stored]
+
+        self.misses += 1
+        path = solve()
+        stored = None if path is None else [forward(*point) for point in path]
+        self.connection.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)",
+                                (key, json.dumps(stored, separators=(",", ":"))))
+        self.connection.commit()
+        return path
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
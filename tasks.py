@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import deque
+
+import render
+import search
+
+# Background solver runs for the Tk front-ends.  The search runs on a daemon
+# thread with a SearchStats whose trace hook appends every expanded cell to a
+# deque; the GUI drains that deque once per frame with root.after, so the
+# window keeps repainting while a large board is searched.  cancel() makes
+# the next trace call raise, which unwinds the search thread.  A task may
+# also carry a budget, a number of expansions and/or seconds; the trace call
+# that goes over it unwinds the search the same way and the task ends with
+# EXHAUSTED as its result.
+
+FRAME_MS = 16
+EXHAUSTED = "budget exhausted"
+
+
+class Cancelled(Exception):
+    pass
+
+
+class BudgetExhausted(Exception):
+    pass
+
+
+class SolverTask:
+    def __init__(self, solve, max_expanded=None, max_seconds=None):
+        # solve(stats) runs one search and returns its result.
+        self.events = deque()
+        self.cancelled = threading.Event()
+        self.root = None
+        self.after_id = None
+        self.max_expanded = max_expanded
+        self.deadline = None if max_seconds is None else time.perf_counter() + max_seconds
+        self.expanded = 0
+        self.thread = threading.Thread(target=self.run, args=(solve,), daemon=True)
+        self.thread.start()
+
+    def trace(self, event, cell):
+        if self.cancelled.is_set():
+            raise Cancelled
+        self.expanded += 1
+        if self.max_expanded is not None and self.expanded > self.max_expanded:
+            raise BudgetExhausted
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise BudgetExhausted
+        self.events.append((event, cell))
+
+    def run(self, solve):
+        try:
+            result = solve(search.SearchStats(trace=self.trace))
+        except Cancelled:
+            return
+        except BudgetExhausted:
+            self.events.append(("done", EXHAUSTED))
+            return
+        except Exception as error:
+            self.events.append(("error", error))
+            return
+        self.events.append(("done", result))
+
+    def drain(self):
+        # Only what is queued now, so a fast search cannot stall a frame.
+        events = self.events
+        return [events.popleft() for _ in range(len(events))]
+
+    def follow(self, root, on_expand, on_done, interval=FRAME_MS):
+        # Polls from the Tk loop: on_expand(cells) once per frame with the
+        # cells expanded since the last frame, on_done(result, error) at the
+        # end, with error None unless the search raised.
+        self.root = root
+
+        def poll():
+            self.after_id = None
+            expanded = []
+            for event, value in self.drain():
+                if event == "expand":
+                    expanded.append(value)
+                elif event in ("done", "error"):
+                    if expanded:
+                        on_expand(expanded)
+                    if event == "done":
+                        on_done(value, None)
+                    else:
+                        on_done(None, value)
+                    return
+            if expanded:
+                on_expand(expanded)
+            if not self.cancelled.is_set():
+                self.after_id = root.after(interval, poll)
+
+        poll()
+
+    def cancel(self):
+        self.cancelled.set()
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+
+class SearchMixin:
+    # start_search/cancel_search for a GameGUI with root, cells (a
+    # render.BoardCanvas) and task.  finish(result) runs on the Tk thread;
+    # a search that raised or ran out of budget is reported in a message
+    # box instead.
+    max_expanded = None
+    max_seconds = 30
+
+    def start_search(self, solve, finish):
+        self.cancel_search()
+        self.cells.clear_marks()
+
+        def done(result, error):
+            self.task = None
+            if error is not None:
+                from tkinter import messagebox
+                messagebox.showerror("خطأ", f"فشل البحث: {type(error).__name__}: {error}")
+            elif result is EXHAUSTED:
+                from tkinter import messagebox
+                messagebox.showinfo("توقف البحث", "نفدت ميزانية البحث قبل الوصول إلى الهدف.")
+            else:
+                finish(result)
+
+        self.task = SolverTask(solve, self.max_expanded, self.max_seconds)
+        self.task.follow(self.root, lambda cells: self.cells.mark(cells, render.EXPLORED), done)
+
+    def cancel_search(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
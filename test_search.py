@@ -0,0 +1,112 @@
+import random
+import unittest
+
+from board import Board
+import batch
+import fields
+import hints
+import mine
+import reach
+import search
+
+# Seeded cross-checks of the engines against plain BFS: every shortest-path
+# engine must return a legal path of the same length, for both move models,
+# with and without the reachability tables built.
+
+SEED = 2024
+BOARDS = 60
+SIZE = 9
+SHORTEST = ("astar", "alt", "bidirectional", "ida", "iddfs", "jps")
+
+
+def random_level(rng, size=SIZE, walls=0.3, blocks=1):
+    # A board and `blocks` (start, goal) pairs on its open cells.
+    layout = ["".join("#" if rng.random() < walls else "." for _ in range(size))
+              for _ in range(size)]
+    board = Board(size, size, layout=layout)
+    opened = [(row, col) for row in range(size) for col in range(size) if layout[row][col] == "."]
+    return (board,) + tuple(rng.choice(opened) for _ in range(2 * blocks))
+
+
+def legal(board, path, model):
+    moves = search.MOVE_MODELS[model](board)
+    return all(board.cell(b) in moves(board.cell(a)) for a, b in zip(path, path[1:]))
+
+
+class EngineTest(unittest.TestCase):
+    def check_engines(self, board, start, goal):
+        for model in search.MOVE_MODELS:
+            expected = search.bfs(board, start, goal, search.MOVE_MODELS[model](board))
+            for engine in SHORTEST:
+                if engine in batch.FIXED_MODELS and batch.FIXED_MODELS[engine] != model:
+                    continue
+                with self.subTest(engine=engine, model=model, start=start, goal=goal):
+                    path = batch.find_path(board, start, goal, engine, model,
+                                           search.TABLE_SIZE, None)
+                    self.assertEqual(len(path), len(expected))
+                    if path:
+                        self.assertEqual((path[0], path[-1]), (start, goal))
+                        self.assertTrue(legal(board, path, model))
+            with self.subTest(engine="field", model=model, start=start, goal=goal):
+                self.assertEqual(len(fields.cache.path(board, start, goal, model)), len(expected))
+            with self.subTest(engine="dfs", model=model, start=start, goal=goal):
+                path = batch.find_path(board, start, goal, "dfs", model, 0, None)
+                self.assertEqual(bool(path), bool(expected))
+                if path:
+                    self.assertTrue(legal(board, path, model))
+
+    def test_against_bfs(self):
+        rng = random.Random(SEED)
+        for _ in range(BOARDS):
+            self.check_engines(*random_level(rng))
+
+    def test_against_bfs_with_reachability(self):
+        rng = random.Random(SEED + 1)
+        for _ in range(BOARDS):
+            board, start, goal = random_level(rng)
+            reach.reachability(board, "step", "slide")
+            self.check_engines(board, start, goal)
+
+    def test_goal_on_wall(self):
+        board = Board(10, 10)
+        for model in search.MOVE_MODELS:
+            for engine in ("bfs", "dfs") + SHORTEST:
+                if batch.FIXED_MODELS.get(engine, model) == model:
+                    with self.subTest(engine=engine, model=model):
+                        self.assertEqual(batch.find_path(board, (1, 1), (0, 1), engine, model,
+                                                         search.TABLE_SIZE, None), [])
+            with self.subTest(engine="field", model=model):
+                self.assertEqual(fields.cache.path(board, (1, 1), (0, 1), model), [])
+
+    def test_reachability_is_exact(self):
+        rng = random.Random(SEED + 2)
+        for _ in range(BOARDS):
+            board, start, goal = random_level(rng)
+            table = reach.reachability(board, "step", "slide")
+            for model in search.MOVE_MODELS:
+                expected = search.bfs(board, start, goal, search.MOVE_MODELS[model](board))
+                self.assertEqual(table.solvable(board.cell(start), board.cell(goal), model),
+                                 bool(expected))
+
+
+class HintTest(unittest.TestCase):
+    def test_hints_match_solver(self):
+        rng = random.Random(SEED + 3)
+        for _ in range(20):
+            board, start, goal, other_start, other_goal = random_level(rng, 5, 0.15, blocks=2)
+            state = mine.State(board, [start, other_start], [goal, other_goal])
+            table = hints.build(state)
+            moves = state.solve()
+            hint = table.lookup(state.cells)
+            with self.subTest(starts=(start, other_start), goals=(goal, other_goal)):
+                if moves is None:
+                    self.assertIsNone(hint)
+                else:
+                    self.assertEqual(hint[0], len(moves))
+                    if moves:
+                        state.move(hint[1])
+                        self.assertEqual(table.lookup(state.cells)[0], len(moves) - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,39 +1,9 @@
-import tkinter as tk
-from tkinter import messagebox
 import time
 
-
-class Board:
-    def __init__(self, rows, cols):
-        self.rows = rows
-        self.cols = cols
-        self.grid = self.initialize_grid()
-
-    def initialize_grid(self):
-        grid = [[1 for _ in range(self.cols)] for _ in range(self.rows)]
-
-        for i in range(self.rows):
-            grid[i][0] = 0
-            grid[i][self.cols - 1] = 0
-        for j in range(self.cols):
-            grid[0][j] = 0
-            grid[self.rows - 1][j] = 0
-
-        manual_walls = [
-            (1, 3), (2, 3), (3, 3), (4, 3),
-            (5, 2), (5, 3), (5, 4),
-            (7, 6), (6, 6), (5, 6), (4, 6),
-            (3, 8), (4, 8), (5, 8),
-            (2, 5), (6, 2), (8, 4)
-        ]
-
-        for (i, j) in manual_walls:
-            grid[i][j] = 0
-
-        grid[1][1] = 1
-        grid[self.rows - 2][self.cols - 2] = 1
-
-        return grid
+from board import Board
+import render
+import search
+import tasks
 
 
 class State:
@@ -49,11 +19,7 @@ class State:
         return position == self.goal
 
     def is_valid(self, position):
-        row, col = position
-        return (0 <= row < self.board.rows and
-                0 <= col < self.board.cols and
-                self.board.grid[row][col] == 1 and
-                position not in self.visited)
+        return self.board.is_open(*position) and position not in self.visited
 
     def dfs_step(self):
         if not self.path:
@@ -87,8 +53,9 @@ class State:
         ]
 
 
-class GameGUI:
+class GameGUI(tasks.SearchMixin):
     def __init__(self, root, state):
+        import tkinter as tk
         self.root = root
         self.state = state
         self.cell_size = 40
@@ -102,48 +69,44 @@ class GameGUI:
         self.reset_button = tk.Button(root, text="إعادة اللعب", command=self.reset_game)
         self.reset_button.pack()
 
+        self.cells = render.BoardCanvas(self.canvas, self.state.board, self.cell_size)
+        self.task = None
         self.draw_board()
 
     def draw_board(self):
-        self.canvas.delete("all")
-        for i in range(self.state.board.rows):
-            for j in range(self.state.board.cols):
-                x1, y1 = j * self.cell_size, i * self.cell_size
-                x2, y2 = x1 + self.cell_size, y1 + self.cell_size
-
-                if (i, j) == self.state.start:
-                    color = "green"
-                elif (i, j) == self.state.goal:
-                    color = "red"
-                elif (i, j) in self.state.path:
-                    color = "yellow"
-                elif self.state.board.grid[i][j] == 0:
-                    color = "black"
-                else:
-                    color = "white"
-
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="gray")
+        board = self.state.board
+        overlay = {board.cell(position): "yellow" for position in self.state.path}
+        overlay[board.cell(self.state.goal)] = "red"
+        overlay[board.cell(self.state.start)] = "green"
+        self.cells.show(overlay)
 
     def run_dfs(self):
-        def step():
-            success = self.state.dfs_step()
-            self.draw_board()
-            if success:
-                messagebox.showinfo("نجاح", "تم العثور على الهدف!")
-                return
-            self.root.after(300, step)  # تنفيذ الخطوة التالية بعد 300 مللي ثانية
+        state = self.state
+        self.start_search(lambda stats: search.dfs(state.board, state.start, state.goal, stats=stats),
+                          self.finish_dfs)
 
-        step()
+    def finish_dfs(self, path):
+        from tkinter import messagebox
+        self.state.path = path
+        self.draw_board()
+        if path:
+            messagebox.showinfo("نجاح", "تم العثور على الهدف!")
+        else:
+            messagebox.showinfo("فشل", "لا يوجد مسار إلى الهدف!")
 
     def reset_game(self):
+        self.cancel_search()
         board = Board(10, 10)
         start = (1, 1)
         goal = (8, 8)
         self.state = State(board, start, goal)
+        self.cells.set_board(self.state.board)
         self.draw_board()
 
 
 if __name__ == "__main__":
+    import tkinter as tk
+
     board = Board(10, 10)
     start = (1, 1)
     goal = (8, 8)